@@ -0,0 +1,267 @@
+"""
+Servidor HTTP local que imita los endpoints de Riot usados por RiotClient,
+con latencia configurable y límites de tasa que responden 429 como la API real.
+"""
+import json
+import multiprocessing
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from benchmarks import synthetic
+
+# Cantidad de partidas base distintas que sirve el servidor
+PAYLOAD_CACHE_SIZE = 64
+
+# Colas que devuelve el filtro ``type`` de Match-V5
+MATCH_TYPE_QUEUES = {"ranked": {420, 440}, "normal": {400, 430, 490}}
+
+
+class _FixedWindow:
+    """Ventana fija de Riot: ``limit`` peticiones cada ``window`` segundos."""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.count = 0
+        self.started = None
+
+    def hit(self, now):
+        if self.started is None or now - self.started >= self.window:
+            self.started = now
+            self.count = 0
+        self.count += 1
+        return self.count <= self.limit
+
+    def retry_after(self, now):
+        return max(1, int(self.started + self.window - now + 0.999))
+
+
+class _MockState:
+    """Estado del servidor dentro del proceso hijo (ventanas, RNG y payloads)."""
+
+    def __init__(self, config, counters):
+        self.latency = config["latency"]
+        self.jitter = config["jitter"]
+        self.error_429_rate = config["error_429_rate"]
+        self.history = synthetic.make_history(config["history_size"])
+        self.tracked_puuids = config["tracked_puuids"]
+        self.seed = config["seed"]
+        self.counters = counters
+        self.lock = threading.Lock()
+        self.rng = random.Random(self.seed)
+        self.windows = [_FixedWindow(limit, window) for limit, window in config["windows"]]
+        self.payloads = {}
+        self.queues = {}
+
+    def admit(self):
+        """Retorna (status, headers) según los límites de tasa simulados."""
+        with self.lock:
+            self.counters["requests"].value += 1
+            now = time.monotonic()
+            allowed = all([window.hit(now) for window in self.windows])
+            headers = {}
+            if self.windows:
+                headers["X-App-Rate-Limit"] = ",".join(f"{w.limit}:{w.window}" for w in self.windows)
+                headers["X-App-Rate-Limit-Count"] = ",".join(f"{w.count}:{w.window}" for w in self.windows)
+            if allowed and self.error_429_rate and self.rng.random() < self.error_429_rate:
+                allowed = False
+            if not allowed:
+                self.counters["throttled"].value += 1
+                retry_after = max([w.retry_after(now) for w in self.windows if w.count > w.limit] or [1])
+                headers["Retry-After"] = str(retry_after)
+                return 429, headers
+            return 200, headers
+
+    def base_payload(self, base_index):
+        with self.lock:
+            base = self.payloads.get(base_index)
+        if base is None:
+            base_id = synthetic.make_match_id(base_index)
+            base = json.dumps(synthetic.make_match(base_id, self.tracked_puuids, self.seed)).encode("utf-8")
+            with self.lock:
+                self.payloads[base_index] = base
+        return base
+
+    def queue_id(self, index):
+        """Cola de la partida ``index`` del historial (la de su partida base)."""
+        base_index = index % PAYLOAD_CACHE_SIZE
+        queue = self.queues.get(base_index)
+        if queue is None:
+            queue = self.queues[base_index] = json.loads(self.base_payload(base_index))["info"]["queueId"]
+        return queue
+
+    def match_payload(self, match_id):
+        """
+        Reutiliza un conjunto fijo de partidas base ya serializadas: solo se
+        reemplazan id y fecha, así generar payloads no domina el tiempo medido.
+        """
+        index = synthetic.match_index(match_id)
+        base_index = index % PAYLOAD_CACHE_SIZE
+        base = self.base_payload(base_index)
+        return (
+            base.replace(f'"{synthetic.make_match_id(base_index)}"'.encode(), f'"{match_id}"'.encode())
+            .replace(f'"gameCreation": {synthetic.match_creation_ms(base_index)}'.encode(),
+                     f'"gameCreation": {synthetic.match_creation_ms(index)}'.encode())
+        )
+
+    def route(self, path, query):
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if parts[:5] == ["riot", "account", "v1", "accounts", "by-riot-id"] and len(parts) == 7:
+            index = zlib.crc32(f"{parts[5]}#{parts[6]}".encode("utf-8")) % len(self.tracked_puuids)
+            return 200, {"puuid": self.tracked_puuids[index], "gameName": parts[5], "tagLine": parts[6]}
+        if parts[:5] == ["lol", "summoner", "v4", "summoners", "by-puuid"] and len(parts) == 6:
+            return 200, {"puuid": parts[5], "summonerLevel": 100, "profileIconId": 6700}
+        if parts[:5] == ["lol", "match", "v5", "matches", "by-puuid"] and len(parts) == 7 and parts[6] == "ids":
+            start = int(query.get("start", ["0"])[0])
+            count = int(query.get("count", ["20"])[0])
+            history = self.history
+            if "queue" in query or "type" in query:
+                queue = int(query["queue"][0]) if "queue" in query else None
+                allowed = MATCH_TYPE_QUEUES.get(query["type"][0], set()) if "type" in query else None
+                history = [
+                    match_id for i, match_id in enumerate(history)
+                    if (queue is None or self.queue_id(i) == queue) and (allowed is None or self.queue_id(i) in allowed)
+                ]
+            return 200, history[start:start + count]
+        if parts[:5] == ["lol", "league", "v4", "entries", "by-puuid"] and len(parts) == 6:
+            return 200, synthetic.make_league_entries(parts[5], self.seed)
+        if parts[:4] == ["lol", "match", "v5", "matches"] and len(parts) == 6 and parts[5] == "timeline":
+            try:
+                index = synthetic.match_index(parts[4])
+            except (IndexError, ValueError):
+                index = -1
+            if not 0 <= index < len(self.history):
+                return 404, {"status": {"status_code": 404, "message": "Data not found"}}
+            return 200, synthetic.make_timeline(parts[4], self.tracked_puuids, self.seed)
+        if parts[:4] == ["lol", "match", "v5", "matches"] and len(parts) == 5:
+            try:
+                index = synthetic.match_index(parts[4])
+            except (IndexError, ValueError):
+                index = -1
+            if not 0 <= index < len(self.history):
+                return 404, {"status": {"status_code": 404, "message": "Data not found"}}
+            return 200, self.match_payload(parts[4])
+        return 404, {"status": {"status_code": 404, "message": "Not found"}}
+
+
+def _make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, igual que la API real
+        disable_nagle_algorithm = True  # evita los ~40 ms de Nagle + ACK retardado
+
+        def do_GET(self):
+            delay = state.latency + (state.rng.random() * state.jitter if state.jitter else 0.0)
+            if delay:
+                time.sleep(delay)
+            status, headers = state.admit()
+            if status == 200:
+                url = urlsplit(self.path)
+                status, body = state.route(url.path, parse_qs(url.query))
+            else:
+                body = {"status": {"status_code": 429, "message": "Rate limit exceeded"}}
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # El backlog por defecto (5) descarta conexiones cuando se abren muchas a la
+    # vez y el cliente espera ~1 s al reintento de SYN
+    request_queue_size = 256
+
+
+def _serve(config, counters, conn):
+    state = _MockState(config, counters)
+    httpd = _Server(("127.0.0.1", 0), _make_handler(state))
+    conn.send(httpd.server_address[1])
+    conn.close()
+    httpd.serve_forever()
+
+
+class MockRiotServer:
+    """
+    Imita Account-V1, Summoner-V4 y Match-V5 (incluida la línea de tiempo) sobre http://127.0.0.1:<puerto>.
+
+    Corre en un proceso aparte para que generar payloads no compita por el GIL
+    con el cliente que se está midiendo.
+
+    - ``latency``: segundos de espera por petición (más ``jitter`` aleatorio).
+    - ``rate_limits``: límites de aplicación como en X-App-Rate-Limit, p. ej. "20:1,100:120".
+    - ``error_429_rate``: fracción de peticiones que responden 429 aunque haya cupo.
+    - ``history_size``: cantidad de partidas del historial de cada PUUID.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, rate_limits="", error_429_rate=0.0,
+                 history_size=100, tracked_puuids=(), seed=0):
+        windows = []
+        for chunk in rate_limits.split(","):
+            if ":" in chunk:
+                limit, window = chunk.strip().split(":")
+                windows.append((int(limit), int(window)))
+        self.config = {
+            "latency": latency,
+            "jitter": jitter,
+            "error_429_rate": error_429_rate,
+            "history_size": history_size,
+            "tracked_puuids": list(tracked_puuids) or [synthetic.make_puuid(0)],
+            "seed": seed,
+            "windows": windows,
+        }
+        self._counters = {"requests": multiprocessing.Value("l", 0), "throttled": multiprocessing.Value("l", 0)}
+        self._process = None
+        self.port = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def requests(self):
+        return self._counters["requests"].value
+
+    @property
+    def throttled(self):
+        return self._counters["throttled"].value
+
+    def start(self):
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(target=_serve, args=(self.config, self._counters, child_conn), daemon=True)
+        self._process.start()
+        self.port = parent_conn.recv()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def attach(self, client):
+        """Apunta un RiotClient (o AsyncRiotClient) a este servidor en lugar de *.api.riotgames.com."""
+        client.platform_base = self.base_url
+        client.regional_base = self.base_url
+        if hasattr(client.session, "mount"):
+            client.session.mount("http://", client.session.get_adapter("https://"))
+        return client
@@ -0,0 +1,219 @@
+"""
+Benchmarks del pipeline fetch → transform → render contra una API de Riot simulada.
+
+Uso (desde riot-lol-cli/):
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 100,1000 --latency 0.02 --rate-limits 20:1,100:120
+    python -m benchmarks.run --stages render --sizes 10000 --json-out bench.json
+    python -m benchmarks.run --stages fetch,fetch-async --sizes 1000 --concurrency 100
+
+Por cada etapa y tamaño informa throughput (items/s), latencia p50/p99 por item
+y pico de memoria (tracemalloc, medido en una pasada aparte para no sesgar los tiempos).
+"""
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+from benchmarks.mock_server import MockRiotServer
+
+import fetch_matches_full
+from src.riot_lol_cli import cli
+from src.riot_lol_cli.api import RiotClient
+from src.riot_lol_cli.async_api import AsyncRiotClient
+from src.riot_lol_cli.projection import project_match
+
+STAGES = ("fetch", "fetch-async", "transform", "render")
+DEFAULT_STAGES = ("fetch", "transform", "render")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(run, items, memory=True):
+    """
+    Ejecuta ``run(record)`` y retorna métricas. ``record(segundos)`` registra la
+    latencia de cada item; ``items`` es la cantidad procesada para el throughput.
+    """
+    latencies = []
+    start = time.perf_counter()
+    run(latencies.append)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        run(lambda _: None)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "items": items,
+        "seconds": round(elapsed, 4),
+        "throughput": round(items / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_mem_mb": round(peak / 1024 / 1024, 2) if peak is not None else None,
+    }
+
+
+def bench_fetch(size, args):
+    """RiotClient.get_match + fetch_match_rows contra el servidor simulado."""
+    puuid = synthetic.make_puuid(0)
+    server = MockRiotServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limits=args.rate_limits,
+        error_429_rate=args.error_429_rate,
+        history_size=size,
+        tracked_puuids=[puuid],
+    )
+    with server:
+        def run(record):
+            client = server.attach(RiotClient("bench-key", "la2", "americas", pool_size=max(10, args.concurrency)))
+            get_match = client.get_match
+
+            def timed_get_match(match_id, project=None):
+                t0 = time.perf_counter()
+                try:
+                    return get_match(match_id, project)
+                finally:
+                    record(time.perf_counter() - t0)
+
+            client.get_match = timed_get_match
+            match_ids = client.iter_match_ids(puuid, limit=size)
+            rows = fetch_matches_full.fetch_match_rows(client, match_ids, puuid, "15.20.1", args.concurrency)
+            for _ in rows:
+                pass
+
+        result = measure(run, size, memory=args.memory)
+        result["requests"] = server.requests
+        result["throttled_429"] = server.throttled
+    return result
+
+
+def bench_fetch_async(size, args):
+    """AsyncRiotClient.get_matches (un solo event loop) contra el servidor simulado."""
+    puuid = synthetic.make_puuid(0)
+    server = MockRiotServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limits=args.rate_limits,
+        error_429_rate=args.error_429_rate,
+        history_size=size,
+        tracked_puuids=[puuid],
+    )
+
+    async def fetch_all(record):
+        async with server.attach(AsyncRiotClient("bench-key", "la2", "americas", pool_size=args.concurrency)) as client:
+            get_match = client.get_match
+
+            async def timed_get_match(match_id, project=None):
+                t0 = time.perf_counter()
+                try:
+                    return await get_match(match_id, project)
+                finally:
+                    record(time.perf_counter() - t0)
+
+            client.get_match = timed_get_match
+            match_ids = [match_id async for match_id in client.iter_match_ids(puuid, limit=size)]
+            for match_id, payload in zip(match_ids, await client.get_matches(match_ids, args.concurrency, project_match)):
+                if not isinstance(payload, BaseException):
+                    fetch_matches_full.build_match_row(payload, match_id, puuid, "15.20.1")
+
+    with server:
+        result = measure(lambda record: asyncio.run(fetch_all(record)), size, memory=args.memory)
+        result["requests"] = server.requests
+        result["throttled_429"] = server.throttled
+    return result
+
+
+def bench_transform(size, args):
+    """Extracción de filas (build_match_row) sobre payloads Match-V5 ya parseados."""
+    puuid = synthetic.make_puuid(0)
+    payloads = [(match_id, synthetic.make_match(match_id, [puuid])) for match_id in synthetic.make_history(min(size, 500))]
+
+    def run(record):
+        for i in range(size):
+            match_id, payload = payloads[i % len(payloads)]
+            t0 = time.perf_counter()
+            fetch_matches_full.build_match_row(payload, match_id, puuid, "15.20.1")
+            record(time.perf_counter() - t0)
+
+    return measure(run, size, memory=args.memory)
+
+
+def bench_render(size, args):
+    """cli.write_html de un matches.json sintético con la plantilla indicada."""
+    data = synthetic.make_output_data(size)
+    template = cli.load_template(args.template)
+
+    def run(record):
+        for _ in range(args.render_repeat):
+            t0 = time.perf_counter()
+            cli.write_html(template, data, args.template, io.StringIO())
+            record((time.perf_counter() - t0) / size)
+
+    result = measure(run, size * args.render_repeat, memory=args.memory)
+    return result
+
+
+BENCHES = {"fetch": bench_fetch, "fetch-async": bench_fetch_async, "transform": bench_transform, "render": bench_render}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline fetch → transform → render")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES), help="Etapas a medir: fetch,fetch-async,transform,render")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Tamaños de historial a medir")
+    parser.add_argument("--fetch-max", type=int, default=1000,
+                        help="Tamaño máximo para la etapa fetch (los mayores se omiten)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Latencia simulada por petición (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latencia aleatoria adicional (s)")
+    parser.add_argument("--rate-limits", default="", help="Límites simulados, p. ej. 20:1,100:120")
+    parser.add_argument("--error-429-rate", type=float, default=0.0, help="Fracción de 429 espontáneos")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--template", default="claude-4-5")
+    parser.add_argument("--render-repeat", type=int, default=3)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="No medir el pico de memoria")
+    parser.add_argument("--json-out", help="Guarda los resultados en un archivo JSON")
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Etapas desconocidas: {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"{'etapa':<12} {'n':>7} {'seg':>9} {'items/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'mem MB':>8}")
+    for stage in stages:
+        for size in sizes:
+            if stage.startswith("fetch") and size > args.fetch_max:
+                continue
+            # Silenciar los prints de progreso del código medido
+            stdout, sys.stdout = sys.stdout, io.StringIO()
+            try:
+                result = BENCHES[stage](size, args)
+            finally:
+                sys.stdout = stdout
+            result.update({"stage": stage, "size": size})
+            results.append(result)
+            mem = f"{result['peak_mem_mb']:.2f}" if result["peak_mem_mb"] is not None else "-"
+            print(f"{stage:<12} {size:>7} {result['seconds']:>9.3f} {result['throughput']:>10.1f} "
+                  f"{result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} {mem:>8}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"Resultados guardados en {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark del arranque del CLI: cuánto tarda ``import`` y un comando trivial.
+
+Uso (desde riot-lol-cli/):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --top 15 --json-out startup.json
+
+Cada medición corre en un proceso nuevo (el arranque en frío es lo que paga
+quien usa el CLI). Informa la mediana y el mínimo del tiempo de pared de
+``version`` y ``--help``, el tiempo de importación acumulado del módulo
+(``python -X importtime``) y los módulos con mayor tiempo propio.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULE = "src.riot_lol_cli.cli"
+DEFAULT_COMMANDS = ("version", "--help")
+
+
+def run_command(module, command):
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", module, *command.split()],
+        cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def import_times(module):
+    """Una corrida de ``-X importtime``: {módulo: (propio µs, acumulado µs)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Encabezado de la tabla
+        times[parts[2].strip()] = (self_us, cumulative_us)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del arranque del CLI")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Módulo del CLI a importar/ejecutar")
+    parser.add_argument("--commands", default=",".join(DEFAULT_COMMANDS), help="Comandos a medir, separados por coma")
+    parser.add_argument("--runs", type=int, default=10, help="Procesos por medición")
+    parser.add_argument("--top", type=int, default=10, help="Módulos más lentos a mostrar")
+    parser.add_argument("--json-out", help="Guarda los resultados en un archivo JSON")
+    args = parser.parse_args(argv)
+
+    commands = [command.strip() for command in args.commands.split(",") if command.strip()]
+    results = {"commands": [], "import": {}}
+
+    print(f"{'comando':<20} {'runs':>5} {'p50 ms':>9} {'min ms':>9}")
+    for command in commands:
+        run_command(args.module, command)  # Calentar los .pyc
+        samples = [run_command(args.module, command) * 1000 for _ in range(args.runs)]
+        result = {"command": command, "runs": args.runs,
+                  "p50_ms": statistics.median(samples), "min_ms": min(samples)}
+        results["commands"].append(result)
+        print(f"{command:<20} {args.runs:>5} {result['p50_ms']:>9.1f} {result['min_ms']:>9.1f}")
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    modules = set().union(*runs)
+    self_ms = {name: statistics.median(run.get(name, (0, 0))[0] for run in runs) / 1000 for name in modules}
+    cumulative_ms = statistics.median(run.get(args.module, (0, 0))[1] for run in runs) / 1000
+    heaviest = sorted(self_ms.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    results["import"] = {"module": args.module, "cumulative_ms": cumulative_ms, "modules": len(modules),
+                         "heaviest": [{"module": name, "self_ms": ms} for name, ms in heaviest]}
+
+    print(f"\nimport {args.module}: {cumulative_ms:.1f} ms (mediana), {len(modules)} módulos")
+    print(f"{'módulo':<40} {'propio ms':>10}")
+    for name, ms in heaviest:
+        print(f"{name:<40} {ms:>10.2f}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"Resultados guardados en {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
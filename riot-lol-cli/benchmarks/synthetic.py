@@ -0,0 +1,222 @@
+"""
+Generador de datos sintéticos con la forma de las respuestas de Riot
+(Account-V1, Summoner-V4, League-V4, Match-V5) y de las filas de matches.json.
+Todo es determinista a partir de una semilla para que las corridas sean comparables.
+"""
+import random
+from datetime import datetime, timedelta
+
+CHAMPIONS = [
+    "Lux", "Ahri", "TwistedFate", "Jinx", "Thresh", "LeeSin", "Garen", "Yasuo",
+    "Ezreal", "Morgana", "Orianna", "Vayne", "Darius", "Leona", "Syndra", "Zed",
+]
+POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+ITEMS = [0, 1001, 1055, 2055, 3006, 3020, 3089, 3135, 3157, 3165, 3175, 3364, 3340, 4645, 6655]
+QUEUES = [420, 440, 400, 450]
+TIERS = ["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND"]
+
+# Marca de tiempo base de la partida más reciente (ms)
+BASE_CREATION_MS = 1760000000000
+
+
+def make_puuid(index):
+    return f"bench-puuid-{index:04d}".ljust(78, "x")
+
+
+def make_match_id(index, platform="LA2"):
+    return f"{platform}_{1500000000 + index}"
+
+
+def match_index(match_id):
+    return int(match_id.split("_", 1)[1]) - 1500000000
+
+
+def match_creation_ms(index):
+    return BASE_CREATION_MS - index * 45 * 60 * 1000
+
+
+def make_participant(rng, puuid, team_id, win):
+    participant = {
+        "puuid": puuid,
+        "teamId": team_id,
+        "win": win,
+        "championName": rng.choice(CHAMPIONS),
+        "champLevel": rng.randint(8, 18),
+        "teamPosition": rng.choice(POSITIONS),
+        "kills": rng.randint(0, 20),
+        "deaths": rng.randint(0, 15),
+        "assists": rng.randint(0, 25),
+        "totalDamageDealtToChampions": rng.randint(3000, 60000),
+        "goldEarned": rng.randint(5000, 20000),
+        "visionScore": rng.randint(0, 90),
+        "totalMinionsKilled": rng.randint(0, 300),
+    }
+    for slot in range(7):
+        participant[f"item{slot}"] = rng.choice(ITEMS)
+    # Relleno con la forma real del payload (cientos de campos por participante)
+    participant["challenges"] = {f"challenge{i}": rng.random() * 100 for i in range(120)}
+    participant["perks"] = {
+        "statPerks": {"defense": 5002, "flex": 5008, "offense": 5005},
+        "styles": [
+            {"description": "primaryStyle", "style": 8100,
+             "selections": [{"perk": 8112 + i, "var1": rng.randint(0, 999), "var2": 0, "var3": 0} for i in range(4)]},
+            {"description": "subStyle", "style": 8300,
+             "selections": [{"perk": 8304 + i, "var1": rng.randint(0, 999), "var2": 0, "var3": 0} for i in range(2)]},
+        ],
+    }
+    participant.update({f"stat{i}": rng.randint(0, 10000) for i in range(60)})
+    return participant
+
+
+def make_match(match_id, tracked_puuids=(), seed=0):
+    """Payload Match-V5 sintético. Los ``tracked_puuids`` ocupan los primeros lugares."""
+    index = match_index(match_id)
+    rng = random.Random(f"{seed}:{match_id}")
+    winning_team = rng.choice([100, 200])
+    participants = []
+    for slot in range(10):
+        puuid = tracked_puuids[slot] if slot < len(tracked_puuids) else f"other-{index}-{slot}"
+        team_id = 100 if slot < 5 else 200
+        participants.append(make_participant(rng, puuid, team_id, team_id == winning_team))
+    rng.shuffle(participants)
+    return {
+        "metadata": {
+            "dataVersion": "2",
+            "matchId": match_id,
+            "participants": [p["puuid"] for p in participants],
+        },
+        "info": {
+            "gameCreation": match_creation_ms(index),
+            "gameDuration": rng.randint(900, 2700),
+            "gameMode": "CLASSIC",
+            "queueId": rng.choice(QUEUES),
+            "platformId": match_id.split("_", 1)[0],
+            "participants": participants,
+            "teams": [{"teamId": 100, "win": winning_team == 100}, {"teamId": 200, "win": winning_team == 200}],
+        },
+    }
+
+
+def make_timeline(match_id, tracked_puuids=(), seed=0):
+    """Payload sintético de /matches/{id}/timeline (frames por minuto y eventos)."""
+    match = make_match(match_id, tracked_puuids, seed)
+    rng = random.Random(f"{seed}:{match_id}:timeline")
+    frame_count = match["info"]["gameDuration"] // 60 + 1
+    totals = [[0] * 6 for _ in range(10)]
+    frames = []
+    for f in range(frame_count):
+        participant_frames = {}
+        for p in range(10):
+            gold, xp, cs, jungle, damage, level = totals[p]
+            totals[p] = [gold + rng.randint(250, 550), xp + rng.randint(300, 600), cs + rng.randint(0, 10),
+                         jungle + rng.randint(0, 2), damage + rng.randint(0, 900), min(18, 1 + f // 2)]
+            participant_frames[str(p + 1)] = {
+                "participantId": p + 1,
+                "totalGold": gold,
+                "currentGold": rng.randint(0, 1500),
+                "xp": xp,
+                "level": level,
+                "minionsKilled": cs,
+                "jungleMinionsKilled": jungle,
+                "goldPerSecond": 0,
+                "timeEnemySpentControlled": rng.randint(0, 5000),
+                "position": {"x": rng.randint(0, 15000), "y": rng.randint(0, 15000)},
+                "championStats": {f"stat{i}": rng.randint(0, 500) for i in range(25)},
+                "damageStats": dict(
+                    {f"damage{i}": rng.randint(0, 20000) for i in range(11)},
+                    totalDamageDoneToChampions=damage,
+                ),
+            }
+        events = [
+            {"type": "ITEM_PURCHASED", "timestamp": f * 60000 + rng.randint(0, 59999),
+             "participantId": rng.randint(1, 10), "itemId": rng.choice(ITEMS)}
+            for _ in range(rng.randint(5, 30))
+        ]
+        frames.append({"timestamp": f * 60000, "participantFrames": participant_frames, "events": events})
+    return {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": match["metadata"]["participants"]},
+        "info": {
+            "frameInterval": 60000,
+            "frames": frames,
+            "participants": [{"participantId": i + 1, "puuid": puuid}
+                             for i, puuid in enumerate(match["metadata"]["participants"])],
+        },
+    }
+
+
+def make_league_entries(puuid, seed=0):
+    """Payload sintético de League-V4 /entries/by-puuid (Solo/Duo y Flex)."""
+    rng = random.Random(f"{seed}:{puuid}")
+    entries = []
+    for queue_type in ("RANKED_SOLO_5x5", "RANKED_FLEX_SR"):
+        entries.append({
+            "queueType": queue_type,
+            "tier": rng.choice(TIERS),
+            "rank": rng.choice(["I", "II", "III", "IV"]),
+            "leaguePoints": rng.randint(0, 99),
+            "wins": rng.randint(10, 200),
+            "losses": rng.randint(10, 200),
+            "puuid": puuid,
+        })
+    return entries
+
+
+def make_history(count, platform="LA2"):
+    """Ids de partidas de un historial de ``count`` juegos (más recientes primero)."""
+    return [make_match_id(i, platform) for i in range(count)]
+
+
+def make_rows(count, seed=0):
+    """Filas con el esquema de matches.json, para medir el render sin red."""
+    rng = random.Random(seed)
+    now = datetime.fromtimestamp(BASE_CREATION_MS / 1000)
+    rows = []
+    for i in range(count):
+        kills, deaths, assists = rng.randint(0, 20), rng.randint(0, 15), rng.randint(0, 25)
+        duration = rng.randint(900, 2700)
+        champ = rng.choice(CHAMPIONS)
+        rows.append({
+            "champ": champ,
+            "champ_id": champ,
+            "champ_level": rng.randint(8, 18),
+            "kda": f"{kills}/{deaths}/{assists}",
+            "kda_ratio": round((kills + assists) / deaths if deaths else kills + assists, 2),
+            "kills": kills,
+            "deaths": deaths,
+            "assists": assists,
+            "win": rng.random() < 0.5,
+            "match_id": make_match_id(i),
+            "items": [rng.choice(ITEMS) for _ in range(7)],
+            "total_damage_dealt": rng.randint(3000, 60000),
+            "gold_earned": rng.randint(5000, 20000),
+            "vision_score": rng.randint(0, 90),
+            "game_duration": f"{duration // 60}:{duration % 60:02d}",
+            "game_duration_seconds": duration,
+            "game_creation": (now - timedelta(minutes=45 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "time_ago": "Hace 1 día",
+            "ddragon_version": "15.20.1",
+        })
+    return rows
+
+
+def make_output_data(count, seed=0):
+    """Estructura completa de matches.json con ``count`` filas."""
+    rows = make_rows(count, seed)
+    wins = sum(1 for row in rows if row["win"])
+    return {
+        "version": 2,
+        "generated_at": "2025-10-11 03:49",
+        "platform": "la2",
+        "server": "LAS",
+        "display_name": "Bench#LAS",
+        "level": 100,
+        "puuid": make_puuid(0),
+        "ddragon_version": "15.20.1",
+        "profileIconId": 6700,
+        "filters": {"range": f"last_{count}", "queue": None, "type": None},
+        "rows": rows,
+        "count": count,
+        "wins": wins,
+        "losses": count - wins,
+        "win_rate": round(wins / count * 100, 1) if count else 0,
+    }
@@ -3,13 +3,28 @@ Script para obtener datos completos de partidas desde la API de Riot
 Incluye: daño, oro, visión, duración, nivel del campeón, etc.
 """
 import argparse
+import contextlib
+import itertools
 import json
 import os
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from src.riot_lol_cli.api import RiotClient
+from src.riot_lol_cli.api import RiotAPIError, RiotClient
+from src.riot_lol_cli.cache import MatchCache
+from src.riot_lol_cli.filters import MATCH_TYPES, QUEUES, parse_queue
+from src.riot_lol_cli.journal import FetchJournal
+from src.riot_lol_cli.league import format_rank, rank_snapshot
+from src.riot_lol_cli.manifest import digest_parts, file_digest
+from src.riot_lol_cli.metrics import profiled, stage
+from src.riot_lol_cli.projection import participant_index, project_match
+from src.riot_lol_cli.rows import NDJSONRowWriter, atomic_write, calculate_time_ago, is_ndjson, read_ndjson
+from src.riot_lol_cli.staticdata import StaticData
+from src.riot_lol_cli.stats import compute_stats
+from src.riot_lol_cli.store import MatchStore
+from src.riot_lol_cli.timeline import TimelineStore, compact_timeline
 
 # Configuración por defecto (se puede sobreescribir por args/env)
 DEFAULT_GAME_NAME = os.getenv("GAME_NAME", "Deshu")
@@ -17,6 +32,15 @@ DEFAULT_TAG_LINE = os.getenv("TAG_LINE", "LAS")
 DEFAULT_PLATFORM = os.getenv("PLATFORM", "la2")
 DEFAULT_REGIONAL = os.getenv("REGIONAL", "americas")
 DEFAULT_MAX_MATCHES = int(os.getenv("MAX_MATCHES", "100"))
+DEFAULT_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "4"))
+DEFAULT_MATCH_CACHE_DIR = os.getenv("MATCH_CACHE_DIR", "data/cache/matches")
+DEFAULT_MATCH_CACHE_MB = int(os.getenv("MATCH_CACHE_MB", "500"))
+DEFAULT_DDRAGON_DIR = os.getenv("DDRAGON_DIR", "data/ddragon")
+DEFAULT_TIMELINE_DIR = os.getenv("TIMELINE_DIR", "data/cache/timelines")
+DEFAULT_MATCH_STORE = os.getenv("MATCH_STORE", "data/cache/matches.db")
+DEFAULT_JOURNAL_DIR = os.getenv("JOURNAL_DIR", "data/cache/jobs")
+DEFAULT_QUEUE = parse_queue(os.getenv("QUEUE") or None)
+DEFAULT_MATCH_TYPE = os.getenv("MATCH_TYPE") or None
 
 
 def find_api_key():
@@ -46,16 +70,609 @@ def find_api_key():
 
     return None
 
+def build_match_row(match_detail, match_id, puuid, ddragon_version):
+    """Extrae la fila de salida del jugador a partir del detalle de la partida.
+
+    Retorna None si el jugador no aparece entre los participantes.
+    """
+    return build_match_rows(match_detail, match_id, [puuid], ddragon_version).get(puuid)
+
+
+def build_match_rows(match_detail, match_id, puuids, ddragon_version):
+    """Extrae las filas de todos los jugadores seguidos presentes en la partida.
+
+    Retorna un dict puuid -> fila, solo con los ``puuids`` que participaron.
+    """
+    participants = participant_index(match_detail)
+    return {
+        puuid: build_participant_row(match_detail, participants[puuid], match_id, ddragon_version)
+        for puuid in puuids
+        if puuid in participants
+    }
+
+
+def build_participant_row(match_detail, participant, match_id, ddragon_version):
+    """Arma la fila de salida de un participante de la partida."""
+    # Calcular KDA ratio
+    kills = participant["kills"]
+    deaths = participant["deaths"]
+    assists = participant["assists"]
+    kda_ratio = ((kills + assists) / deaths) if deaths > 0 else (kills + assists)
+
+    # Duración de la partida
+    game_duration_seconds = match_detail["info"]["gameDuration"]
+    game_duration_minutes = game_duration_seconds // 60
+    game_duration_display = f"{game_duration_minutes // 60}:{game_duration_minutes % 60:02d}" if game_duration_minutes >= 60 else f"{game_duration_minutes}:{game_duration_seconds % 60:02d}"
+
+    # Timestamp
+    game_creation = match_detail["info"]["gameCreation"]
+    game_date = datetime.fromtimestamp(game_creation / 1000)
+    time_ago = calculate_time_ago(game_date)
+
+    return {
+        "champ": participant["championName"],
+        "champ_id": participant["championName"],
+        "champ_level": participant["champLevel"],
+        "role": participant.get("teamPosition", ""),
+        "queue_id": match_detail["info"].get("queueId"),
+        "kda": f"{kills}/{deaths}/{assists}",
+        "kda_ratio": round(kda_ratio, 2),
+        "kills": kills,
+        "deaths": deaths,
+        "assists": assists,
+        "win": participant["win"],
+        "match_id": match_id,
+        "items": [
+            participant["item0"],
+            participant["item1"],
+            participant["item2"],
+            participant["item3"],
+            participant["item4"],
+            participant["item5"],
+            participant["item6"]  # Trinket
+        ],
+        "total_damage_dealt": participant["totalDamageDealtToChampions"],
+        "gold_earned": participant["goldEarned"],
+        "vision_score": participant["visionScore"],
+        "game_duration": game_duration_display,
+        "game_duration_seconds": game_duration_seconds,
+        "game_creation": game_date.strftime("%Y-%m-%d %H:%M:%S"),
+        "time_ago": time_ago,
+        "ddragon_version": ddragon_version
+    }
+
+
+def fetch_match_details(client, match_ids, extract, concurrency=1, journal=None, timelines=None):
+    """Obtiene los detalles de las partidas con un pool acotado de hilos.
+
+    ``match_ids`` puede ser cualquier iterable (p. ej. ``RiotClient.iter_match_ids``).
+    ``extract(match_detail, match_id)`` transforma cada partida; sus resultados se
+    generan en el mismo orden que ``match_ids``. Un None (ningún jugador seguido
+    en la partida) se avisa y se omite. Los errores de cada partida se informan y
+    se omiten sin afectar al resto. El ritmo de las peticiones lo regula el
+    limitador de ``RiotClient``.
+
+    ``extract`` recibe la proyección de la partida (``projection.project_match``),
+    no la respuesta cruda: el payload completo se suelta apenas se proyecta.
+
+    Con un ``FetchJournal`` cada resultado se anota apenas se obtiene y las
+    partidas ya anotadas (de una corrida interrumpida) no se vuelven a pedir.
+    El progreso se imprime en orden y solo para las partidas descargadas (las
+    del journal o de la caché no generan líneas).
+
+    Con un ``TimelineStore`` también se guarda la línea de tiempo de cada partida
+    con resultado. Si no se puede obtener, las filas se entregan igual pero la
+    partida no se anota en el journal y cuenta como fallida: al retomar se vuelve
+    a intentar.
+    """
+    def fetch_one(match_id):
+        """Corre en un hilo del pool: retorna (origen, resultado, error) sin imprimir."""
+        if journal is not None and match_id in journal:
+            source, result = "journal", journal.result(match_id)
+        else:
+            source = "cache" if client.match_cache is not None and match_id in client.match_cache else "api"
+            try:
+                result = extract(client.get_match(match_id, project=project_match), match_id)
+            except Exception as e:
+                if journal is not None:
+                    journal.record_failure()
+                return "error", None, e
+        if result is not None:
+            try:
+                store_timeline(client, timelines, match_id)
+            except Exception as e:
+                # Sin anotarla: el journal solo refleja partidas completas
+                if journal is not None:
+                    journal.record_failure()
+                return source, result, e
+        if journal is not None and source != "journal":
+            journal.record_match(match_id, result)
+        return source, result, None
+
+    def collect(index, match_id, future):
+        # Se imprime desde el consumidor, en el orden de match_ids y sin mezclar líneas
+        source, result, error = future.result()
+        if source == "error":
+            print(f"❌ [{index}] Error obteniendo detalles de {match_id}: {error}")
+            return None
+        if source == "api":
+            print(f"📡 [{index}] Detalles de {match_id} descargados")
+        if error is not None:
+            print(f"⚠️  [{index}] No se pudo obtener la línea de tiempo de {match_id}: {error}")
+        elif result is None and source != "journal":
+            print(f"⚠️  [{index}] No se encontró al jugador en la partida {match_id}")
+        return result
+
+    workers = max(1, concurrency)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Se consume match_ids de forma perezosa: como mucho 2x workers partidas en
+        # vuelo, así el listado de páginas y la descarga de detalles se solapan.
+        for i, match_id in enumerate(match_ids, 1):
+            pending.append((i, match_id, executor.submit(fetch_one, match_id)))
+            while len(pending) >= workers * 2:
+                result = collect(*pending.popleft())
+                if result is not None:
+                    yield result
+        while pending:
+            result = collect(*pending.popleft())
+            if result is not None:
+                yield result
+
+def store_timeline(client, timelines, match_id):
+    """Descarga y guarda en forma compacta la línea de tiempo de una partida, si falta. Propaga los errores."""
+    if timelines is None or match_id in timelines:
+        return
+    with stage("fetch.timeline"):
+        timelines.put(compact_timeline(client.get_match_timeline(match_id)))
+
+
+def extract_match_rows(match_detail, match_id, puuids, ddragon_version, store=None):
+    """
+    Como ``build_match_rows``; con un ``MatchStore`` además guarda la partida con
+    las filas de todos sus participantes (así sirve para cualquier cuenta).
+    """
+    with stage("fetch.extract"):
+        if store is None:
+            return build_match_rows(match_detail, match_id, puuids, ddragon_version)
+        all_puuids = [p.get("puuid") for p in match_detail["info"]["participants"]]
+        rows = build_match_rows(match_detail, match_id, all_puuids, ddragon_version)
+    with stage("fetch.store"):
+        store.put_match(match_detail, rows)
+    return {puuid: rows[puuid] for puuid in puuids if puuid in rows}
+
+
+def fetch_match_rows(client, match_ids, puuid, ddragon_version, concurrency=1, timelines=None, store=None,
+                     journal=None):
+    """
+    Genera las filas de un jugador para ``match_ids``, en orden (ver ``fetch_match_details``).
+    Con un ``TimelineStore`` también guarda la línea de tiempo de cada partida,
+    con un ``MatchStore``, la partida en la base SQLite y con un ``FetchJournal``,
+    el progreso para poder retomar.
+    """
+    def extract(match_detail, match_id):
+        return extract_match_rows(match_detail, match_id, [puuid], ddragon_version, store).get(puuid)
+
+    return fetch_match_details(client, match_ids, extract, concurrency, journal, timelines)
+
+
+def load_existing_output(path):
+    """Lee un matches.json (o .ndjson) previo. Retorna None si no existe o no es válido."""
+    output_file = Path(path)
+    if not output_file.exists():
+        return None
+    try:
+        if is_ndjson(output_file):
+            header, rows = read_ndjson(output_file)
+            data = dict(header, rows=list(rows))
+        else:
+            with open(output_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("rows"), list):
+        return None
+    return data
+
+
+def newest_game_creation(rows):
+    """Retorna el epoch (segundos) de la partida más reciente de ``rows``, o None."""
+    newest = None
+    for row in rows:
+        try:
+            game_date = datetime.strptime(row["game_creation"], "%Y-%m-%d %H:%M:%S")
+        except (KeyError, TypeError, ValueError):
+            continue
+        if newest is None or game_date > newest:
+            newest = game_date
+    return int(newest.timestamp()) if newest else None
+
+
+def merge_rows(new_rows, old_rows):
+    """Une filas nuevas y previas sin duplicar ``match_id``; las nuevas van primero.
+
+    Es un generador: las filas nuevas se entregan a medida que llegan.
+    """
+    seen = set()
+    for row in itertools.chain(new_rows, old_rows):
+        match_id = row.get("match_id")
+        if match_id in seen:
+            continue
+        seen.add(match_id)
+        if row.get("game_creation"):
+            # Refrescar el "Hace X" de las filas reutilizadas
+            try:
+                row["time_ago"] = calculate_time_ago(datetime.strptime(row["game_creation"], "%Y-%m-%d %H:%M:%S"))
+            except ValueError:
+                pass
+        yield row
+
+
+def parse_riot_ids(path):
+    """Lee un archivo con un Riot ID (nombre#tag) por línea. Ignora vacías y comentarios."""
+    riot_ids = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            game_name, sep, tag_line = line.rpartition("#")
+            if not sep or not game_name or not tag_line:
+                raise ValueError(f"Riot ID inválido (se espera nombre#tag): {line}")
+            riot_ids.append((game_name, tag_line))
+    return riot_ids
+
+
+def account_slug(game_name, tag_line):
+    """Nombre de archivo para una cuenta, p. ej. Deshu#LAS -> deshu-las."""
+    return f"{game_name}-{tag_line}".lower().replace(" ", "_")
+
+
+def resolve_account(client, game_name, tag_line, journal=None, ranks=True):
+    """Obtiene PUUID, nivel, ícono y rango de una cuenta a partir de su Riot ID (o del journal)."""
+    riot_id = f"{game_name}#{tag_line}"
+    if journal is not None and journal.account(riot_id) is not None:
+        account = journal.account(riot_id)
+        print(f"♻️  Cuenta {riot_id} retomada del journal (PUUID: {account['puuid']})")
+        return account
+    with stage("fetch.account"):
+        print(f"📡 Obteniendo cuenta para {game_name}#{tag_line}...")
+        account = client.get_account_by_riot_id(game_name, tag_line)
+        puuid = account["puuid"]
+        print(f"✅ PUUID: {puuid}")
+
+        print("📡 Obteniendo datos del invocador...")
+        summoner = client.get_summoner_by_puuid(puuid)
+    summoner_level = summoner.get("summonerLevel", 0)
+    profile_icon_id = summoner.get("profileIconId", 0)
+    print(f"✅ Nivel: {summoner_level}, Icono: {profile_icon_id}")
+
+    account = {
+        "game_name": game_name,
+        "tag_line": tag_line,
+        "puuid": puuid,
+        "level": summoner_level,
+        "profileIconId": profile_icon_id,
+    }
+    if ranks:
+        account["ranks"] = fetch_ranks(client, puuid)
+    if journal is not None:
+        journal.record_account(riot_id, account)
+    return account
+
+
+def fetch_ranks(client, puuid):
+    """Foto del rango (League-V4); queda en el journal junto con la cuenta. None si falla."""
+    try:
+        with stage("fetch.ranks"):
+            ranks = rank_snapshot(client.get_league_entries_by_puuid(puuid))
+    except RiotAPIError as e:
+        print(f"⚠️  No se pudo obtener el rango: {e}")
+        return None
+    print(f"✅ Rango Solo/Duo: {format_rank(ranks, 420)}, Flex: {format_rank(ranks, 440)}")
+    return ranks
+
+
+def fetch_filters(args):
+    """Filtros del listado de ids; se envían a Match-V5 y quedan en la cabecera de la salida."""
+    return {
+        "range": "all" if args.all else f"last_{args.count}",
+        "queue": args.queue,
+        "type": args.match_type,
+    }
+
+
+def same_filters(previous, args):
+    """Si una salida previa se descargó con la misma cola y tipo que esta corrida."""
+    filters = previous.get("filters") or {}
+    if previous.get("version", 1) < 2:
+        # Las salidas v1 declaraban la cola 420 pero traían todas las colas
+        filters = {}
+    return filters.get("queue") == args.queue and filters.get("type") == args.match_type
+
+
+def list_new_match_ids(client, args, puuid, output_path, journal=None):
+    """Itera los ids a descargar y retorna también las filas previas (modo incremental).
+
+    Con un ``FetchJournal``, la lista completa de ids se anota al terminar de
+    recorrerla; al retomar se usa esa lista y no se vuelve a paginar.
+    """
+    previous_rows = []
+    start_time = None
+    if args.incremental:
+        previous = load_existing_output(output_path)
+        if previous and previous.get("puuid") == puuid and not same_filters(previous, args):
+            print("⚠️  Los datos previos usan otros filtros de cola/tipo, se hará una descarga completa")
+        elif previous and previous.get("puuid") == puuid:
+            previous_rows = previous["rows"]
+            start_time = newest_game_creation(previous_rows)
+        else:
+            print("⚠️  No hay datos previos de este jugador, se hará una descarga completa")
+    listed = journal.listed_ids(puuid) if journal is not None else None
+    if listed is not None:
+        print(f"♻️  {len(listed)} ids retomados del journal ({sum(1 for match_id in listed if match_id in journal)} ya descargados)")
+        return iter(listed), previous_rows
+    if args.queue is not None or args.match_type is not None:
+        print(f"🔎 Solo partidas de {describe_filters(args)} (filtrado por Match-V5)")
+    if start_time is not None:
+        print(f"📡 Obteniendo partidas nuevas desde {datetime.fromtimestamp(start_time):%Y-%m-%d %H:%M}...")
+    elif args.all:
+        print("📡 Obteniendo el historial completo de partidas...")
+    else:
+        print(f"📡 Obteniendo últimas {args.count} partidas...")
+    limit = None if args.all or start_time is not None else args.count
+    known_ids = {row.get("match_id") for row in previous_rows}
+    match_ids = (
+        match_id
+        for match_id in client.iter_match_ids(puuid, start_time=start_time, limit=limit,
+                                              queue=args.queue, match_type=args.match_type)
+        if match_id not in known_ids
+    )
+    if journal is not None:
+        match_ids = _record_listed_ids(match_ids, puuid, journal)
+    return match_ids, previous_rows
+
+
+def describe_filters(args):
+    parts = []
+    if args.queue is not None:
+        names = [name for name, queue in QUEUES.items() if queue == args.queue]
+        parts.append(f"la cola {args.queue}" + (f" ({names[0]})" if names else ""))
+    if args.match_type is not None:
+        parts.append(f"tipo {args.match_type}")
+    return ", ".join(parts)
+
+
+def _record_listed_ids(match_ids, puuid, journal):
+    listed = []
+    for match_id in match_ids:
+        listed.append(match_id)
+        yield match_id
+    journal.record_ids(puuid, listed)
+
+
+def build_output_header(platform, account, ddragon_version, filters):
+    """Metadatos de la cuenta: la cabecera de matches.json / la primera línea del NDJSON."""
+    return {
+        "version": 2,
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "platform": platform,
+        "server": account["tag_line"].upper(),
+        "display_name": f"{account['game_name']}#{account['tag_line']}",
+        "level": account["level"],
+        "puuid": account["puuid"],
+        "ddragon_version": ddragon_version,
+        "profileIconId": account["profileIconId"],
+        "ranks": account.get("ranks"),
+        "filters": filters,
+    }
+
+
+def write_output(path, header, rows):
+    """Guarda las filas (JSON indentado o NDJSON según la extensión) e imprime el resumen."""
+    output_file = Path(path)
+
+    if is_ndjson(output_file):
+        # Cada fila se escribe apenas llega; no se acumulan en memoria
+        with NDJSONRowWriter(output_file, header) as writer:
+            writer.write_all(rows)
+        total_matches, wins = writer.count, writer.wins
+    else:
+        rows = list(rows)
+        stats = compute_stats(rows)
+        total_matches, wins = stats["games"], stats["wins"]
+        output_data = dict(header)
+        output_data.update({
+            "rows": rows,
+            "count": total_matches,
+            "wins": wins,
+            "losses": stats["losses"],
+            "win_rate": stats["win_rate"],
+        })
+        # Se escribe aparte y se renombra: un corte no deja un matches.json a medias
+        with atomic_write(output_file) as f:
+            json.dump(output_data, f, indent=2, ensure_ascii=False)
+
+    win_rate = (wins / total_matches * 100) if total_matches > 0 else 0
+    print(f"\n✅ ¡Datos guardados exitosamente en {output_file}!")
+    print(f"📊 Estadísticas:")
+    print(f"   Total de partidas: {total_matches}")
+    print(f"   Victorias: {wins}")
+    print(f"   Derrotas: {total_matches - wins}")
+    print(f"   Win Rate: {win_rate:.1f}%")
+
+
+def open_timeline_store(args):
+    return TimelineStore(args.timeline_dir) if args.timelines else None
+
+
+def open_match_store(args):
+    return MatchStore(args.store) if args.store else None
+
+
+def run_single(client, args, ddragon_version, store=None, journal=None):
+    """Descarga las partidas de la cuenta indicada por --game-name/--tag-line."""
+    account = resolve_account(client, args.game_name, args.tag_line, journal, args.ranks)
+    puuid = account["puuid"]
+    if store is not None:
+        store.put_account(account, args.platform, ddragon_version)
+
+    # Obtener IDs de partidas (solo las nuevas en modo incremental)
+    match_ids, previous_rows = list_new_match_ids(client, args, puuid, args.output, journal)
+
+    # Obtener detalles de cada partida (en paralelo, preservando el orden).
+    # Los ids se listan por páginas mientras ya se descargan los detalles, y
+    # en NDJSON cada fila se escribe apenas se obtiene.
+    matches_data = fetch_match_rows(client, match_ids, puuid, ddragon_version, args.concurrency,
+                                    timelines=open_timeline_store(args), store=store, journal=journal)
+    header = build_output_header(args.platform, account, ddragon_version, fetch_filters(args))
+    write_output(args.output, header, merge_rows(matches_data, previous_rows))
+
+
+def run_batch(client, args, ddragon_version, store=None, journal=None):
+    """
+    Descarga las partidas de todas las cuentas de --batch con un único cliente.
+    Cada partida compartida se descarga una sola vez y de ella se extraen las
+    filas de todos los jugadores seguidos; se escribe un JSON por cuenta.
+    """
+    riot_ids = parse_riot_ids(args.batch)
+    print(f"👥 {len(riot_ids)} cuentas en {args.batch}")
+
+    accounts = []
+    for game_name, tag_line in riot_ids:
+        try:
+            accounts.append(resolve_account(client, game_name, tag_line, journal, args.ranks))
+        except Exception as e:
+            print(f"❌ Error obteniendo la cuenta {game_name}#{tag_line}: {e}")
+    tracked_puuids = [account["puuid"] for account in accounts]
+    if store is not None:
+        for account in accounts:
+            store.put_account(account, args.platform, ddragon_version)
+
+    # Listar ids por cuenta y unificarlos preservando el orden de aparición
+    output_paths = {}
+    previous_rows = {}
+    unique_ids = {}
+    for account in accounts:
+        puuid = account["puuid"]
+        output_paths[puuid] = Path(args.output_dir) / f"{account_slug(account['game_name'], account['tag_line'])}.{args.format}"
+        try:
+            match_ids, previous_rows[puuid] = list_new_match_ids(client, args, puuid, output_paths[puuid], journal)
+            for match_id in match_ids:
+                unique_ids.setdefault(match_id, None)
+        except Exception as e:
+            print(f"❌ Error listando partidas de {account['game_name']}#{account['tag_line']}: {e}")
+            previous_rows.setdefault(puuid, [])
+    print(f"✅ {len(unique_ids)} partidas únicas para {len(accounts)} cuentas")
+
+    def extract(match_detail, match_id):
+        return extract_match_rows(match_detail, match_id, tracked_puuids, ddragon_version, store) or None
+
+    rows_by_puuid = {puuid: [] for puuid in tracked_puuids}
+    for rows in fetch_match_details(client, unique_ids, extract, args.concurrency, journal,
+                                    open_timeline_store(args)):
+        for puuid, row in rows.items():
+            rows_by_puuid[puuid].append(row)
+
+    for account in accounts:
+        puuid = account["puuid"]
+        # Más recientes primero, como las devuelve Match-V5
+        new_rows = sorted(rows_by_puuid[puuid], key=lambda row: row["game_creation"], reverse=True)
+        header = build_output_header(args.platform, account, ddragon_version, fetch_filters(args))
+        write_output(output_paths[puuid], header, merge_rows(new_rows, previous_rows[puuid]))
+
+
+def job_key(args):
+    """Identifica un trabajo de fetch por las opciones que cambian su resultado."""
+    accounts = file_digest(args.batch) if args.batch else f"{args.game_name}#{args.tag_line}".lower()
+    options = {
+        key: getattr(args, key)
+        for key in ("platform", "regional", "count", "all", "incremental", "output", "output_dir", "format",
+                    "queue", "match_type", "ranks")
+    }
+    return digest_parts("fetch", bool(args.batch), accounts, options)
+
+
+def open_journal(args):
+    """
+    Abre el journal del trabajo; con --resume retoma el de una corrida interrumpida.
+
+    Si ya hay uno con estas opciones y no se pasó --resume ni --restart, retorna
+    None en lugar de pisarlo: ese progreso no se descarta sin pedirlo.
+    """
+    key = job_key(args)
+    path = Path(args.journal_dir) / f"fetch-{key[:16]}.journal"
+    existed = path.exists()
+    if existed and not (args.resume or args.restart):
+        print(f"❌ Hay un trabajo interrumpido con estas opciones ({path})")
+        print("   Usa --resume para retomarlo o --restart para descartarlo y empezar de cero")
+        return None
+    journal = FetchJournal(path, key, resume=args.resume)
+    if journal.resumed:
+        print(f"♻️  Retomando trabajo: {len(journal)} partidas ya descargadas ({path})")
+    elif args.resume:
+        print("⚠️  No hay un trabajo interrumpido con estas opciones; se empieza de cero")
+    elif existed:
+        print("🗑️  Se descartó el trabajo interrumpido con estas opciones (--restart)")
+    return journal
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch de partidas desde Riot API y guarda matches.json")
     parser.add_argument("--game-name", dest="game_name", default=DEFAULT_GAME_NAME)
     parser.add_argument("--tag-line", dest="tag_line", default=DEFAULT_TAG_LINE)
+    parser.add_argument("--batch", dest="batch",
+                        help="Archivo con un Riot ID (nombre#tag) por línea; ignora --game-name/--tag-line")
+    parser.add_argument("--output-dir", dest="output_dir", default="data/cache",
+                        help="Directorio de salida en modo --batch (un JSON por cuenta)")
+    parser.add_argument("--format", dest="format", choices=["json", "ndjson"], default="json",
+                        help="Formato de salida en modo --batch (en modo simple se deduce de --output)")
     parser.add_argument("--platform", dest="platform", default=DEFAULT_PLATFORM,
                         help="la2, la1, na1, br1, euw1, eun1, tr1, ru, kr, jp1, oc1")
     parser.add_argument("--regional", dest="regional", default=DEFAULT_REGIONAL,
                         help="americas, europe, asia")
-    parser.add_argument("--count", dest="count", type=int, default=DEFAULT_MAX_MATCHES)
+    parser.add_argument("--count", dest="count", type=int, default=DEFAULT_MAX_MATCHES,
+                        help="Cantidad de partidas a obtener (se pagina de a 100 si es mayor)")
+    parser.add_argument("--all", dest="all", action="store_true",
+                        help="Recorre el historial completo, ignorando --count")
+    parser.add_argument("--queue", dest="queue", type=parse_queue, default=DEFAULT_QUEUE,
+                        help=f"Solo partidas de esta cola: id o {', '.join(QUEUES)} (Match-V5 no lista las demás)")
+    parser.add_argument("--type", dest="match_type", choices=MATCH_TYPES, default=DEFAULT_MATCH_TYPE,
+                        help="Solo partidas de este tipo (p. ej. ranked: Solo/Duo y Flex)")
+    parser.add_argument("--no-ranks", dest="ranks", action="store_false",
+                        help="No consulta el rango (League-V4) de las cuentas")
     parser.add_argument("--output", dest="output", default="data/cache/matches.json")
+    parser.add_argument("--concurrency", dest="concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Cantidad de partidas a descargar en paralelo (1 = secuencial)")
+    parser.add_argument("--match-cache-dir", dest="match_cache_dir", default=DEFAULT_MATCH_CACHE_DIR,
+                        help="Directorio de la caché de partidas crudas")
+    parser.add_argument("--match-cache-mb", dest="match_cache_mb", type=int, default=DEFAULT_MATCH_CACHE_MB,
+                        help="Tamaño máximo de la caché de partidas (MB, expulsión LRU)")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true",
+                        help="Ignora la caché de partidas y descarga todo de nuevo")
+    parser.add_argument("--ddragon-dir", dest="ddragon_dir", default=DEFAULT_DDRAGON_DIR,
+                        help="Caché en disco de Data Dragon (versiones, item.json, champion.json)")
+    parser.add_argument("--timelines", dest="timelines", action="store_true",
+                        help="También descarga la línea de tiempo de cada partida (oro/xp/CS por minuto)")
+    parser.add_argument("--timeline-dir", dest="timeline_dir", default=DEFAULT_TIMELINE_DIR,
+                        help="Directorio de las líneas de tiempo compactas")
+    parser.add_argument("--store", dest="store", default=DEFAULT_MATCH_STORE,
+                        help="Base SQLite compartida donde también se guardan las partidas")
+    parser.add_argument("--no-store", dest="store", action="store_const", const=None,
+                        help="No escribe en la base SQLite")
+    parser.add_argument("--incremental", dest="incremental", action="store_true",
+                        help="Solo descarga partidas más nuevas que las ya guardadas en --output")
+    resume_group = parser.add_mutually_exclusive_group()
+    resume_group.add_argument("--resume", dest="resume", action="store_true",
+                              help="Retoma el trabajo interrumpido con las mismas opciones (sin repetir peticiones)")
+    resume_group.add_argument("--restart", dest="restart", action="store_true",
+                              help="Descarta el trabajo interrumpido con las mismas opciones y empieza de cero")
+    parser.add_argument("--journal-dir", dest="journal_dir", default=DEFAULT_JOURNAL_DIR,
+                        help="Directorio de los journals de trabajos de fetch")
+    parser.add_argument("--metrics-out", dest="metrics_out",
+                        help="Escribe un resumen JSON de métricas (peticiones por endpoint, latencias, esperas)")
+    parser.add_argument("--profile", dest="profile", action="store_true",
+                        help="Ejecuta con cProfile (perfil en <metrics-out>.prof) y muestra las funciones más costosas")
     args = parser.parse_args()
 
     API_KEY = find_api_key()
@@ -68,185 +685,60 @@ def main():
         print("  - api_key.txt")
         return
 
+    journal = open_journal(args)
+    if journal is None:
+        return
+
     print("🔧 Inicializando cliente de Riot API...")
-    client = RiotClient(API_KEY, args.platform, args.regional)
-    
-    try:
-        # 1. Obtener cuenta por Riot ID
-        print(f"📡 Obteniendo cuenta para {args.game_name}#{args.tag_line}...")
-        account = client.get_account_by_riot_id(args.game_name, args.tag_line)
-        puuid = account["puuid"]
-        print(f"✅ PUUID: {puuid}")
-        
-        # 2. Obtener datos del invocador
-        print("📡 Obteniendo datos del invocador...")
-        summoner = client.get_summoner_by_puuid(puuid)
-        summoner_level = summoner.get("summonerLevel", 0)
-        profile_icon_id = summoner.get("profileIconId", 0)
-        print(f"✅ Nivel: {summoner_level}, Icono: {profile_icon_id}")
-        
-        # 3. Obtener versión de Data Dragon
-        print("📡 Obteniendo versión de Data Dragon...")
-        versions = client.get_ddragon_versions()
-        ddragon_version = versions[0]
-        print(f"✅ Versión: {ddragon_version}")
-        
-        # 4. Obtener IDs de partidas
-        print(f"📡 Obteniendo últimas {args.count} partidas...")
-        match_ids = client.get_match_ids_by_puuid(puuid, start=0, count=args.count)
-        print(f"✅ Se encontraron {len(match_ids)} partidas")
-        
-        # 5. Obtener detalles de cada partida
-        matches_data = []
-        wins = 0
-        losses = 0
-        
-        for i, match_id in enumerate(match_ids, 1):
-            print(f"📡 [{i}/{len(match_ids)}] Obteniendo detalles de {match_id}...")
-            
+    match_cache = None
+    if not args.no_cache:
+        match_cache = MatchCache(args.match_cache_dir, max_bytes=args.match_cache_mb * 1024 * 1024)
+    client = RiotClient(API_KEY, args.platform, args.regional, pool_size=max(10, args.concurrency),
+                        match_cache=match_cache, static_data=StaticData(args.ddragon_dir))
+    store = open_match_store(args)
+    completed = False
+
+    instrumented = profiled(args.metrics_out, args.profile) if args.metrics_out or args.profile else contextlib.nullcontext()
+    with instrumented as metrics:
+        try:
+            # Versión de Data Dragon (una sola vez para todas las cuentas)
+            print("📡 Obteniendo versión de Data Dragon...")
+            versions = client.get_ddragon_versions()
+            ddragon_version = versions[0]
+            print(f"✅ Versión: {ddragon_version}")
             try:
-                match_detail = client.get_match(match_id)
-                
-                # Buscar al jugador en los participantes
-                participant = None
-                for p in match_detail["info"]["participants"]:
-                    if p["puuid"] == puuid:
-                        participant = p
-                        break
-                
-                if not participant:
-                    print(f"⚠️  No se encontró al jugador en la partida {match_id}")
-                    continue
-                
-                # Extraer datos
-                win = participant["win"]
-                if win:
-                    wins += 1
-                else:
-                    losses += 1
-                
-                # Calcular KDA ratio
-                kills = participant["kills"]
-                deaths = participant["deaths"]
-                assists = participant["assists"]
-                kda_ratio = ((kills + assists) / deaths) if deaths > 0 else (kills + assists)
-                
-                # Duración de la partida
-                game_duration_seconds = match_detail["info"]["gameDuration"]
-                game_duration_minutes = game_duration_seconds // 60
-                game_duration_display = f"{game_duration_minutes // 60}:{game_duration_minutes % 60:02d}" if game_duration_minutes >= 60 else f"{game_duration_minutes}:{game_duration_seconds % 60:02d}"
-                
-                # Timestamp
-                game_creation = match_detail["info"]["gameCreation"]
-                game_date = datetime.fromtimestamp(game_creation / 1000)
-                time_ago = calculate_time_ago(game_date)
-                
-                match_data = {
-                    "champ": participant["championName"],
-                    "champ_id": participant["championName"],
-                    "champ_level": participant["champLevel"],
-                    "kda": f"{kills}/{deaths}/{assists}",
-                    "kda_ratio": round(kda_ratio, 2),
-                    "kills": kills,
-                    "deaths": deaths,
-                    "assists": assists,
-                    "win": win,
-                    "match_id": match_id,
-                    "items": [
-                        participant["item0"],
-                        participant["item1"],
-                        participant["item2"],
-                        participant["item3"],
-                        participant["item4"],
-                        participant["item5"],
-                        participant["item6"]  # Trinket
-                    ],
-                    "total_damage_dealt": participant["totalDamageDealtToChampions"],
-                    "gold_earned": participant["goldEarned"],
-                    "vision_score": participant["visionScore"],
-                    "game_duration": game_duration_display,
-                    "game_duration_seconds": game_duration_seconds,
-                    "game_creation": game_date.strftime("%Y-%m-%d %H:%M:%S"),
-                    "time_ago": time_ago,
-                    "ddragon_version": ddragon_version
-                }
-                
-                matches_data.append(match_data)
-                
-                # Rate limiting: pequeña pausa entre requests
-                time.sleep(0.1)
-                
+                # Nombres de ítems y campeones para el render (se guardan en disco por versión)
+                client.static_data.warm(ddragon_version)
             except Exception as e:
-                print(f"❌ Error obteniendo detalles de {match_id}: {e}")
-                continue
-        
-        # 6. Calcular estadísticas
-        total_matches = len(matches_data)
-        win_rate = (wins / total_matches * 100) if total_matches > 0 else 0
-        
-        # 7. Crear estructura de datos final
-        output_data = {
-            "version": 1,
-            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "platform": args.platform,
-            "server": args.tag_line.upper(),
-            "display_name": f"{args.game_name}#{args.tag_line}",
-            "level": summoner_level,
-            "puuid": puuid,
-            "ddragon_version": ddragon_version,
-            "profileIconId": profile_icon_id,
-            "filters": {
-                "range": "last_100",
-                "queue": 420  # Ranked Solo/Duo
-            },
-            "rows": matches_data,
-            "count": total_matches,
-            "wins": wins,
-            "losses": losses,
-            "win_rate": round(win_rate, 1)
-        }
-        
-        # 8. Guardar en archivo JSON
-        output_dir = Path(args.output).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = Path(args.output)
-        
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"\n✅ ¡Datos guardados exitosamente en {output_file}!")
-        print(f"📊 Estadísticas:")
-        print(f"   Total de partidas: {total_matches}")
-        print(f"   Victorias: {wins}")
-        print(f"   Derrotas: {losses}")
-        print(f"   Win Rate: {win_rate:.1f}%")
+                print(f"⚠️  No se pudieron obtener los datos estáticos de Data Dragon: {e}")
+
+            if args.batch:
+                run_batch(client, args, ddragon_version, store, journal)
+            else:
+                run_single(client, args, ddragon_version, store, journal)
+            completed = True
+
+            if match_cache is not None:
+                cache_stats = match_cache.stats()
+                print(f"💾 Caché de partidas: {cache_stats['hits']} aciertos, {cache_stats['misses']} descargas")
+                if metrics is not None:
+                    metrics.incr("match_cache.hits", cache_stats["hits"])
+                    metrics.incr("match_cache.misses", cache_stats["misses"])
         
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
-
-def calculate_time_ago(game_date):
-    """Calcula cuánto tiempo hace que se jugó la partida"""
-    now = datetime.now()
-    delta = now - game_date
-    
-    if delta.days > 365:
-        years = delta.days // 365
-        return f"Hace {years} año{'s' if years > 1 else ''}"
-    elif delta.days > 30:
-        months = delta.days // 30
-        return f"Hace {months} mes{'es' if months > 1 else ''}"
-    elif delta.days > 0:
-        return f"Hace {delta.days} día{'s' if delta.days > 1 else ''}"
-    elif delta.seconds > 3600:
-        hours = delta.seconds // 3600
-        return f"Hace {hours} hora{'s' if hours > 1 else ''}"
-    elif delta.seconds > 60:
-        minutes = delta.seconds // 60
-        return f"Hace {minutes} minuto{'s' if minutes > 1 else ''}"
-    else:
-        return "Hace un momento"
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if store is not None:
+                store.close()
+            if completed and not journal.failed:
+                journal.finish()
+            else:
+                journal.close()
+                if journal.failed:
+                    print(f"⚠️  {journal.failed} partidas fallaron.", end=" ")
+                print(f"El progreso quedó en {journal.path}; vuelve a correr con --resume para continuar")
 
 if __name__ == "__main__":
     main()
@@ -36,8 +36,11 @@ def increment_version():
     
     return new_version
 
-# Versión actual
-__version__ = get_version()
+def __getattr__(name):
+    # __version__ se lee de config/version.json recién cuando alguien lo pide
+    if name == "__version__":
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "regions",
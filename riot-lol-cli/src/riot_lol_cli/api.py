@@ -1,58 +1,114 @@
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
 
 import requests
 
+from .cache import MatchCache
+from .metrics import Metrics, active
+from .projection import loads
+from .ratelimit import RateLimiter
+from .staticdata import StaticData, StaticDataError
+
 
 class RiotAPIError(Exception):
     pass
 
 
+def error_for_status(status_code: int, text: str) -> RiotAPIError:
+    """Traduce una respuesta no exitosa de Riot a RiotAPIError."""
+    if status_code in (401, 403):
+        detail = text.strip()
+        return RiotAPIError(f"No autorizado (401/403). Detalle: {detail}")
+    if status_code == 404:
+        return RiotAPIError("Recurso no encontrado (404)")
+    # Otros códigos
+    return RiotAPIError(f"Error de Riot API: {status_code} - {text}")
+
+
 class RiotClient:
-    def __init__(self, api_key: str, platform: str, regional: str, timeout: int = 10):
+    def __init__(
+        self,
+        api_key: str,
+        platform: str,
+        regional: str,
+        timeout: int = 10,
+        pool_size: int = 10,
+        limiter: Optional[RateLimiter] = None,
+        match_cache: Optional[MatchCache] = None,
+        static_data: Optional[StaticData] = None,
+        metrics: Optional[Metrics] = None,
+    ):
         self.api_key = api_key
         self.platform = platform.lower()
         self.regional = regional.lower()
         self.timeout = timeout
         self.session = requests.Session()
+        # Pool de conexiones acorde a la cantidad de hilos que comparten la sesión
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
         self.session.headers.update({
             "X-Riot-Token": self.api_key,
         })
         self.platform_base = f"https://{self.platform}.api.riotgames.com"
         self.regional_base = f"https://{self.regional}.api.riotgames.com"
+        # Limitador proactivo por host de enrutamiento y por endpoint
+        self.limiter = limiter or RateLimiter()
+        # Caché opcional de partidas terminadas (inmutables)
+        self.match_cache = match_cache
+        # Data Dragon memoizado, usando la misma sesión (sin enviar la API key)
+        self.static_data = static_data or StaticData(session=self.session, timeout=self.timeout)
+        if self.static_data.session is None:
+            self.static_data.session = self.session
+        # Métricas de peticiones (si es None, las de la corrida activa, si las hay)
+        self.metrics = metrics
+        # Entradas de League-V4 por PUUID: el rango se pide una sola vez por corrida
+        self._league_entries: Dict[str, List[Dict[str, Any]]] = {}
 
-    def _request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None, retries: int = 3) -> Any:
+    def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        retries: int = 3,
+        endpoint: Optional[str] = None,
+    ) -> Any:
+        host = urlsplit(url).netloc
+        endpoint = endpoint or urlsplit(url).path
+        metrics = self.metrics or active()
         attempt = 0
         backoff = 1.0
         while True:
+            waited = self.limiter.acquire(host, endpoint)
+            started = time.perf_counter()
             resp = self.session.request(method, url, params=params, timeout=self.timeout)
+            if metrics is not None:
+                metrics.record_request(endpoint, resp.status_code, time.perf_counter() - started,
+                                       len(resp.content), waited)
+            self.limiter.update(host, endpoint, resp.headers)
             if resp.status_code == 429:
                 retry_after = resp.headers.get("Retry-After")
                 sleep_s = float(retry_after) if retry_after and retry_after.isdigit() else backoff
-                time.sleep(sleep_s)
+                self.limiter.block(host, sleep_s)
+                if metrics is not None:
+                    metrics.record_retry(endpoint, sleep_s)
                 attempt += 1
                 backoff = min(backoff * 2, 10)
                 if attempt > retries:
                     raise RiotAPIError("Rate limit excedido repetidamente (429)")
                 continue
             if resp.status_code == 200:
-                return resp.json()
-            if resp.status_code in (401, 403):
-                detail = resp.text.strip()
-                raise RiotAPIError(f"No autorizado (401/403). Detalle: {detail}")
-            if resp.status_code == 404:
-                raise RiotAPIError("Recurso no encontrado (404)")
-            # Otros códigos
-            raise RiotAPIError(f"Error de Riot API: {resp.status_code} - {resp.text}")
+                return loads(resp.content)
+            raise error_for_status(resp.status_code, resp.text)
 
     # Summoner-V4
     def get_summoner_by_name(self, summoner_name: str) -> Dict[str, Any]:
         url = f"{self.platform_base}/lol/summoner/v4/summoners/by-name/{requests.utils.quote(summoner_name)}"
-        return self._request("GET", url)
+        return self._request("GET", url, endpoint="summoner-v4.by-name")
 
     def get_summoner_by_puuid(self, puuid: str) -> Dict[str, Any]:
         url = f"{self.platform_base}/lol/summoner/v4/summoners/by-puuid/{requests.utils.quote(puuid)}"
-        return self._request("GET", url)
+        return self._request("GET", url, endpoint="summoner-v4.by-puuid")
 
     # Account-V1 (por Riot ID)
     def get_account_by_riot_id(self, game_name: str, tag_line: str) -> Dict[str, Any]:
@@ -60,7 +116,19 @@ class RiotClient:
             f"{self.regional_base}/riot/account/v1/accounts/by-riot-id/"
             f"{requests.utils.quote(game_name)}/{requests.utils.quote(tag_line)}"
         )
-        return self._request("GET", url)
+        return self._request("GET", url, endpoint="account-v1.by-riot-id")
+
+    # League-V4
+    def get_league_entries_by_puuid(self, puuid: str) -> List[Dict[str, Any]]:
+        """Entradas de liga de la cuenta (una por cola clasificatoria jugada); ver ``league.rank_snapshot``."""
+        entries = self._league_entries.get(puuid)
+        if entries is None:
+            url = f"{self.platform_base}/lol/league/v4/entries/by-puuid/{requests.utils.quote(puuid)}"
+            entries = self._request("GET", url, endpoint="league-v4.entries-by-puuid")
+            if not isinstance(entries, list):
+                raise RiotAPIError("Respuesta inesperada al obtener las ligas")
+            self._league_entries[puuid] = entries
+        return entries
 
     # Match-V5
     def get_match_ids_by_puuid(
@@ -70,6 +138,8 @@ class RiotClient:
         count: int = 10,
         start_time: Optional[int] = None,
         end_time: Optional[int] = None,
+        queue: Optional[int] = None,
+        match_type: Optional[str] = None,
     ) -> List[str]:
         url = f"{self.regional_base}/lol/match/v5/matches/by-puuid/{puuid}/ids"
         params: Dict[str, Any] = {"start": start, "count": count}
@@ -77,22 +147,71 @@ class RiotClient:
             params["startTime"] = int(start_time)
         if end_time is not None:
             params["endTime"] = int(end_time)
-        data = self._request("GET", url, params=params)
+        # Filtros del lado de Riot: las partidas de otras colas ni se listan
+        if queue is not None:
+            params["queue"] = int(queue)
+        if match_type is not None:
+            params["type"] = match_type
+        data = self._request("GET", url, params=params, endpoint="match-v5.ids-by-puuid")
         if not isinstance(data, list):
             raise RiotAPIError("Respuesta inesperada al listar ids de partidas")
         return data
 
-    def get_match(self, match_id: str) -> Dict[str, Any]:
-        url = f"{self.regional_base}/lol/match/v5/matches/{match_id}"
-        return self._request("GET", url)
+    def iter_match_ids(
+        self,
+        puuid: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        queue: Optional[int] = None,
+        match_type: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Recorre el historial completo de ids de partidas, página a página.
+        Las páginas se piden de forma perezosa, a medida que se consumen los ids,
+        hasta agotar el historial o alcanzar ``limit``.
+        """
+        page_size = max(1, min(page_size, 100))  # Match-V5 no acepta más de 100 por página
+        start = 0
+        yielded = 0
+        while limit is None or yielded < limit:
+            count = page_size if limit is None else min(page_size, limit - yielded)
+            page = self.get_match_ids_by_puuid(puuid, start=start, count=count, start_time=start_time, end_time=end_time,
+                                               queue=queue, match_type=match_type)
+            for match_id in page:
+                yield match_id
+            yielded += len(page)
+            if len(page) < count:
+                return
+            start += len(page)
+
+    def get_match(
+        self,
+        match_id: str,
+        project: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Detalle de una partida. Con ``project`` (p. ej. ``projection.project_match``)
+        retorna solo la proyección y el payload crudo se libera al salir; la
+        caché siempre guarda la respuesta completa.
+        """
+        data = self.match_cache.get(match_id) if self.match_cache is not None else None
+        if data is None:
+            url = f"{self.regional_base}/lol/match/v5/matches/{match_id}"
+            data = self._request("GET", url, endpoint="match-v5.match")
+            if self.match_cache is not None:
+                self.match_cache.put(match_id, data)
+        return project(data) if project is not None else data
+
+    def get_match_timeline(self, match_id: str) -> Dict[str, Any]:
+        """Línea de tiempo cruda (frames por minuto); ver ``timeline.compact_timeline``."""
+        url = f"{self.regional_base}/lol/match/v5/matches/{match_id}/timeline"
+        return self._request("GET", url, endpoint="match-v5.timeline")
 
     # Data Dragon
     def get_ddragon_versions(self) -> List[str]:
-        url = "https://ddragon.leagueoflegends.com/api/versions.json"
-        resp = requests.get(url, timeout=self.timeout)
-        if resp.status_code != 200:
-            raise RiotAPIError(f"No se pudieron obtener versiones de Data Dragon: {resp.status_code}")
-        data = resp.json()
-        if not isinstance(data, list) or not data:
-            raise RiotAPIError("Respuesta inesperada de Data Dragon versions")
-        return data
+        try:
+            return self.static_data.versions()
+        except StaticDataError as e:
+            raise RiotAPIError(f"No se pudieron obtener versiones de Data Dragon: {e}")
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+from .rows import atomic_write
+
+if TYPE_CHECKING:
+    from .staticdata import StaticData
+
+DDRAGON_CDN = "https://ddragon.leagueoflegends.com/cdn"
+
+# Modos de render de íconos
+ASSET_MODES = ("remote", "local", "inline")
+
+# GIF transparente de 1x1 usado como src provisorio en modo inline
+BLANK_IMG = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+
+def icon_url(version: str, kind: str, name: Union[int, str]) -> str:
+    """URL remota de un ícono de Data Dragon (kind: item, champion, profileicon)."""
+    return f"{DDRAGON_CDN}/{version}/img/{kind}/{name}.png"
+
+
+def _version_key(version: str):
+    return [int(part) if part.isdigit() else 0 for part in version.split(".")]
+
+
+class AssetStore:
+    """
+    Copia local de íconos de Data Dragon: ``<root>/<versión>/img/<kind>/<nombre>.png``.
+
+    Cada ícono se descarga una sola vez por versión. Al usar una versión nueva se
+    borran las más viejas, conservando ``keep_versions`` en total.
+    """
+
+    def __init__(self, root: Union[str, Path], keep_versions: int = 2, timeout: int = 10):
+        self.root = Path(root)
+        self.keep_versions = keep_versions
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pruned = set()
+
+    def path_for(self, version: str, kind: str, name: Union[int, str]) -> Path:
+        return self.root / version / "img" / kind / f"{name}.png"
+
+    def ensure(self, version: str, kind: str, name: Union[int, str]) -> Optional[Path]:
+        """Retorna la ruta local del ícono, descargándolo si falta. None si no se pudo."""
+        path = self.path_for(version, kind, name)
+        if path.exists():
+            return path
+        import requests
+
+        try:
+            resp = requests.get(icon_url(version, kind, name), timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if resp.status_code != 200:
+            return None
+        with atomic_write(path, "wb") as f:
+            f.write(resp.content)
+        self.prune(version)
+        return path
+
+    def prune(self, current_version: str) -> None:
+        """Borra las versiones viejas, conservando la actual y las más recientes."""
+        with self._lock:
+            if current_version in self._pruned or not self.root.exists():
+                return
+            self._pruned.add(current_version)
+            versions = sorted((p.name for p in self.root.iterdir() if p.is_dir()), key=_version_key, reverse=True)
+            keep = {current_version}
+            for version in versions:
+                if len(keep) >= self.keep_versions:
+                    break
+                keep.add(version)
+            for version in versions:
+                if version not in keep:
+                    shutil.rmtree(self.root / version, ignore_errors=True)
+
+
+class IconResolver:
+    """
+    Decide qué poner en el ``src`` de cada ícono según el modo de render:
+
+    - ``remote``: URL del CDN de Data Dragon (comportamiento original).
+    - ``local``: ruta relativa a la copia local en ``AssetStore``.
+    - ``inline``: un GIF vacío; ``script_html()`` genera un único mapa de data URIs
+      (uno por ícono distinto) que completa los ``src`` al cargar la página.
+
+    Si un ícono no se puede descargar, se usa la URL remota. Con ``static_data``
+    también resuelve nombres de ítems y campeones para los tooltips.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        mode: str = "remote",
+        store: Optional[AssetStore] = None,
+        output_dir: Optional[Union[str, Path]] = None,
+        static_data: Optional["StaticData"] = None,
+    ):
+        if mode not in ASSET_MODES:
+            raise ValueError(f"Modo de íconos no soportado: {mode}. Usa uno de: {', '.join(ASSET_MODES)}")
+        if mode != "remote" and store is None:
+            raise ValueError(f"El modo '{mode}' requiere un AssetStore")
+        self.version = version
+        self.mode = mode
+        self.store = store
+        self.output_dir = Path(output_dir) if output_dir is not None else Path.cwd()
+        self.static_data = static_data
+        self._cache: Dict[tuple, str] = {}
+        self._inline: Dict[str, Dict[str, str]] = {}
+
+    def _resolve(self, kind: str, name: Union[int, str]) -> str:
+        key = (kind, str(name))
+        src = self._cache.get(key)
+        if src is not None:
+            return src
+        src = icon_url(self.version, kind, name)
+        if self.mode != "remote":
+            path = self.store.ensure(self.version, kind, name)
+            if path is not None and self.mode == "local":
+                src = Path(os.path.relpath(path.resolve(), self.output_dir.resolve())).as_posix()
+            elif path is not None:
+                encoded = base64.b64encode(path.read_bytes()).decode("ascii")
+                self._inline.setdefault(kind, {})[str(name)] = f"data:image/png;base64,{encoded}"
+                src = BLANK_IMG
+        self._cache[key] = src
+        return src
+
+    def item(self, item_id: Union[int, str]) -> str:
+        return self._resolve("item", item_id)
+
+    def champion(self, champ_id: str) -> str:
+        return self._resolve("champion", champ_id)
+
+    def item_name(self, item_id: Union[int, str]) -> Optional[str]:
+        if self.static_data is None:
+            return None
+        return self.static_data.item_name(self.version, item_id)
+
+    def champion_name(self, champ_id: str) -> Optional[str]:
+        if self.static_data is None:
+            return None
+        return self.static_data.champion_name(self.version, champ_id)
+
+    def profile_icon(self, icon_id: Union[int, str]) -> str:
+        src = self._resolve("profileicon", icon_id)
+        if src == BLANK_IMG:
+            # El ícono de perfil va en CSS: se inserta directamente como data URI
+            return self._inline["profileicon"][str(icon_id)]
+        return src
+
+    def script_html(self) -> str:
+        """Script que completa los íconos inline (vacío fuera del modo inline)."""
+        if self.mode != "inline" or not self._inline:
+            return ""
+        icons = json.dumps({kind: icons for kind, icons in self._inline.items() if kind != "profileicon"})
+        return (
+            "<script>(function(){var I=" + icons + ";"
+            "document.querySelectorAll('.item[data-item-id] img.item-icon').forEach(function(img){"
+            "var s=(I.item||{})[img.parentNode.getAttribute('data-item-id')];if(s)img.src=s;});"
+            "document.querySelectorAll('img.champ-icon[data-champion-id]').forEach(function(img){"
+            "var s=(I.champion||{})[img.getAttribute('data-champion-id')];if(s)img.src=s;});"
+            "})();</script>"
+        )
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Union
+from urllib.parse import quote, urlsplit
+
+from .api import RiotAPIError, error_for_status
+from .cache import MatchCache
+from .metrics import Metrics, active
+from .projection import loads
+from .ratelimit import RateLimiter
+from .staticdata import StaticData
+
+
+class AsyncRiotClient:
+    """
+    Contraparte asyncio de ``RiotClient`` (requiere ``aiohttp``).
+
+    Misma superficie y mismas reglas de reintento/429 que ``RiotClient._request``,
+    con un pool de conexiones keep-alive acotado por host de enrutamiento. Las
+    corrutinas se pueden cancelar en cualquier punto (incluidas las esperas del
+    limitador). Usar como ``async with AsyncRiotClient(...) as client:``.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        platform: str,
+        regional: str,
+        timeout: int = 10,
+        pool_size: int = 10,
+        limiter: Optional[RateLimiter] = None,
+        match_cache: Optional[MatchCache] = None,
+        static_data: Optional[StaticData] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        try:
+            import aiohttp
+        except ImportError:
+            raise RiotAPIError("AsyncRiotClient requiere aiohttp: pip install aiohttp")
+        self._aiohttp = aiohttp
+        self.api_key = api_key
+        self.platform = platform.lower()
+        self.regional = regional.lower()
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.platform_base = f"https://{self.platform}.api.riotgames.com"
+        self.regional_base = f"https://{self.regional}.api.riotgames.com"
+        # Se puede compartir el limitador con un RiotClient síncrono de la misma key
+        self.limiter = limiter or RateLimiter()
+        self.match_cache = match_cache
+        self.static_data = static_data or StaticData(timeout=timeout)
+        self.metrics = metrics
+        self._league_entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            connector = self._aiohttp.TCPConnector(limit=0, limit_per_host=self.pool_size)
+            self._session = self._aiohttp.ClientSession(
+                connector=connector,
+                headers={"X-Riot-Token": self.api_key},
+                timeout=self._aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncRiotClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _acquire(self, host: str, endpoint: str) -> float:
+        waited = 0.0
+        while True:
+            wait = self.limiter.reserve(host, endpoint)
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        retries: int = 3,
+        endpoint: Optional[str] = None,
+    ) -> Any:
+        host = urlsplit(url).netloc
+        endpoint = endpoint or urlsplit(url).path
+        metrics = self.metrics or active()
+        attempt = 0
+        backoff = 1.0
+        while True:
+            waited = await self._acquire(host, endpoint)
+            started = time.perf_counter()
+            async with self.session.request(method, url, params=params) as resp:
+                body = await resp.read()
+                if metrics is not None:
+                    metrics.record_request(endpoint, resp.status, time.perf_counter() - started, len(body), waited)
+                self.limiter.update(host, endpoint, resp.headers)
+                if resp.status == 429:
+                    retry_after = resp.headers.get("Retry-After")
+                    sleep_s = float(retry_after) if retry_after and retry_after.isdigit() else backoff
+                    self.limiter.block(host, sleep_s)
+                    if metrics is not None:
+                        metrics.record_retry(endpoint, sleep_s)
+                    attempt += 1
+                    backoff = min(backoff * 2, 10)
+                    if attempt > retries:
+                        raise RiotAPIError("Rate limit excedido repetidamente (429)")
+                    continue
+                if resp.status == 200:
+                    return loads(body)
+                raise error_for_status(resp.status, body.decode("utf-8", errors="replace"))
+
+    # Summoner-V4
+    async def get_summoner_by_puuid(self, puuid: str) -> Dict[str, Any]:
+        url = f"{self.platform_base}/lol/summoner/v4/summoners/by-puuid/{quote(puuid)}"
+        return await self._request("GET", url, endpoint="summoner-v4.by-puuid")
+
+    # Account-V1 (por Riot ID)
+    async def get_account_by_riot_id(self, game_name: str, tag_line: str) -> Dict[str, Any]:
+        url = (
+            f"{self.regional_base}/riot/account/v1/accounts/by-riot-id/"
+            f"{quote(game_name)}/{quote(tag_line)}"
+        )
+        return await self._request("GET", url, endpoint="account-v1.by-riot-id")
+
+    # League-V4
+    async def get_league_entries_by_puuid(self, puuid: str) -> List[Dict[str, Any]]:
+        entries = self._league_entries.get(puuid)
+        if entries is None:
+            url = f"{self.platform_base}/lol/league/v4/entries/by-puuid/{quote(puuid)}"
+            entries = await self._request("GET", url, endpoint="league-v4.entries-by-puuid")
+            if not isinstance(entries, list):
+                raise RiotAPIError("Respuesta inesperada al obtener las ligas")
+            self._league_entries[puuid] = entries
+        return entries
+
+    # Match-V5
+    async def get_match_ids_by_puuid(
+        self,
+        puuid: str,
+        start: int = 0,
+        count: int = 10,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        queue: Optional[int] = None,
+        match_type: Optional[str] = None,
+    ) -> List[str]:
+        url = f"{self.regional_base}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        params: Dict[str, Any] = {"start": start, "count": count}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        if end_time is not None:
+            params["endTime"] = int(end_time)
+        # Filtros del lado de Riot: las partidas de otras colas ni se listan
+        if queue is not None:
+            params["queue"] = int(queue)
+        if match_type is not None:
+            params["type"] = match_type
+        data = await self._request("GET", url, params=params, endpoint="match-v5.ids-by-puuid")
+        if not isinstance(data, list):
+            raise RiotAPIError("Respuesta inesperada al listar ids de partidas")
+        return data
+
+    async def iter_match_ids(
+        self,
+        puuid: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        queue: Optional[int] = None,
+        match_type: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Versión asíncrona de ``RiotClient.iter_match_ids``."""
+        page_size = max(1, min(page_size, 100))
+        start = 0
+        yielded = 0
+        while limit is None or yielded < limit:
+            count = page_size if limit is None else min(page_size, limit - yielded)
+            page = await self.get_match_ids_by_puuid(puuid, start=start, count=count, start_time=start_time, end_time=end_time,
+                                                     queue=queue, match_type=match_type)
+            for match_id in page:
+                yield match_id
+            yielded += len(page)
+            if len(page) < count:
+                return
+            start += len(page)
+
+    async def get_match(
+        self,
+        match_id: str,
+        project: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        data = None
+        if self.match_cache is not None:
+            data = await asyncio.to_thread(self.match_cache.get, match_id)
+        if data is None:
+            url = f"{self.regional_base}/lol/match/v5/matches/{match_id}"
+            data = await self._request("GET", url, endpoint="match-v5.match")
+            if self.match_cache is not None:
+                await asyncio.to_thread(self.match_cache.put, match_id, data)
+        return project(data) if project is not None else data
+
+    async def get_match_timeline(self, match_id: str) -> Dict[str, Any]:
+        url = f"{self.regional_base}/lol/match/v5/matches/{match_id}/timeline"
+        return await self._request("GET", url, endpoint="match-v5.timeline")
+
+    async def get_matches(
+        self,
+        match_ids: Sequence[str],
+        concurrency: int = 50,
+        project: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Descarga varias partidas con como mucho ``concurrency`` en vuelo. Retorna
+        los resultados en el orden de ``match_ids``; un error queda como la
+        excepción en su posición, sin afectar al resto. ``project`` como en
+        ``get_match`` (conviene para listas largas: solo se retienen proyecciones).
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(match_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_match(match_id, project)
+
+        return await asyncio.gather(*(fetch_one(match_id) for match_id in match_ids), return_exceptions=True)
+
+    # Data Dragon
+    async def get_ddragon_versions(self) -> List[str]:
+        # Memoizado por StaticData (TTL); solo la primera llamada toca la red
+        try:
+            return await asyncio.to_thread(self.static_data.versions)
+        except Exception as e:
+            raise RiotAPIError(f"No se pudieron obtener versiones de Data Dragon: {e}")
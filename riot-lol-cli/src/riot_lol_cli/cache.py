@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .projection import loads
+from .rows import atomic_write
+
+
+class MatchCache:
+    """
+    Caché en disco de respuestas crudas de Match-V5, un archivo .json.gz por match_id.
+
+    Las partidas terminadas no cambian, así que una entrada nunca caduca: solo
+    se expulsa por tamaño, empezando por la usada hace más tiempo (LRU).
+    Lleva contadores de aciertos y fallos para informar al final de cada ejecución.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 500 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # match_id -> tamaño en bytes, en orden de uso (el primero es el más antiguo)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    def _path(self, match_id: str) -> Path:
+        return self.directory / f"{match_id}{self.SUFFIX}"
+
+    def _load_index(self) -> None:
+        if not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name[: -len(self.SUFFIX)], stat.st_size))
+        for _, match_id, size in sorted(entries):
+            self._index[match_id] = size
+            self._total_bytes += size
+
+    def get(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna la partida cacheada o None si no está (o el archivo está dañado)."""
+        path = self._path(match_id)
+        with self._lock:
+            if match_id not in self._index:
+                self.misses += 1
+                return None
+        try:
+            with gzip.open(path, "rb") as f:
+                data = loads(f.read())
+        except (OSError, EOFError, ValueError):
+            with self._lock:
+                self._forget(match_id)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            if match_id in self._index:
+                self._index.move_to_end(match_id)
+        try:
+            # Persistir el uso reciente para la política LRU entre ejecuciones
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, match_id: str, data: Dict[str, Any]) -> None:
+        """Guarda la respuesta cruda de una partida y aplica la expulsión por tamaño."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(match_id)
+        with atomic_write(path, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        size = path.stat().st_size
+        with self._lock:
+            self._forget(match_id)
+            self._index[match_id] = size
+            self._total_bytes += size
+            self._evict()
+
+    def _forget(self, match_id: str) -> None:
+        size = self._index.pop(match_id, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            match_id, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(match_id).unlink()
+            except FileNotFoundError:
+                pass
+
+    def __contains__(self, match_id: str) -> bool:
+        with self._lock:
+            return match_id in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de uso de la caché."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+            }
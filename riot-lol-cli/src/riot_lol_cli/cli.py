@@ -1,16 +1,58 @@
+from __future__ import annotations
+
 import click
+import functools
+import io
+import itertools
 import json
+import logging
 import os
+import time
 from datetime import datetime
+from functools import lru_cache
+from html import escape
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import IO, TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Any, Union
+
+from .assets import ASSET_MODES, AssetStore, IconResolver, icon_url
+from .filters import QUEUES, RESULTS, MatchFilter, parse_queue
+from .html import CompiledTemplate, compile_template, load_compiled_template
+from .league import format_rank
+from .metrics import stage
+from .rows import is_ndjson, read_ndjson
+
+# Módulos pesados (sqlite3, hashlib, multiprocessing, NumPy...) se importan
+# dentro de los comandos que los usan: `cli version` no paga por ellos.
+if TYPE_CHECKING:
+    from .manifest import FragmentCache, RenderManifest
+    from .stats import MatchColumns
+    from .store import MatchStore
+
+logger = logging.getLogger(__name__)
 
 # Create a Click command group
 @click.group()
 @click.version_option()
-def cli():
+@click.option('--verbose', '-v', count=True, help='Más detalle en los logs (-v: info, -vv: debug)')
+def cli(verbose: int):
     """CLI principal para la generación de estadísticas de League of Legends."""
-    pass
+    level = logging.DEBUG if verbose > 1 else logging.INFO if verbose else logging.WARNING
+    logging.basicConfig(level=level, format='%(levelname)s: %(message)s')
+
+def profile_options(command):
+    """Agrega --metrics-out y --profile a un comando y envuelve su ejecución con ``metrics.profiled``."""
+    @click.option('--metrics-out', type=click.Path(dir_okay=False),
+                  help='Escribe un resumen JSON de métricas (peticiones, tiempos por etapa)')
+    @click.option('--profile', is_flag=True,
+                  help='Ejecuta con cProfile (perfil en <metrics-out>.prof) y muestra las funciones más costosas')
+    @functools.wraps(command)
+    def wrapper(*args, metrics_out: Optional[str] = None, profile: bool = False, **kwargs):
+        if not metrics_out and not profile:
+            return command(*args, **kwargs)
+        from .metrics import profiled
+        with profiled(metrics_out, profile):
+            return command(*args, **kwargs)
+    return wrapper
 
 # Configuración de rutas
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -18,12 +60,21 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 OUTPUT_DIR = BASE_DIR / "outputs"
 DATA_DIR = BASE_DIR / "data"
 CACHE_DIR = DATA_DIR / "cache"
+DDRAGON_DIR = DATA_DIR / "ddragon"
+MATCH_STORE = CACHE_DIR / "matches.db"
+TIMELINE_DIR = CACHE_DIR / "timelines"
+# Hashes de lo último renderizado y fragmentos de filas reutilizables
+RENDER_MANIFEST = OUTPUT_DIR / ".render-manifest.json"
+FRAGMENTS_DIR = OUTPUT_DIR / ".fragments"
 CONFIG_DIR = BASE_DIR / "config"
 VERSION_FILE = CONFIG_DIR / "version.json"
 
-# Asegurar que los directorios existan
-for directory in [TEMPLATES_DIR, OUTPUT_DIR, DATA_DIR, CACHE_DIR, CONFIG_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+# Las filas renderizadas se guardan en memoria hasta este tamaño y luego en disco
+ROWS_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+ROWS_CHUNK_SIZE = 64 * 1024
+
+# Versión de Data Dragon si el JSON no trae 'ddragon_version'
+DEFAULT_DDRAGON_VERSION = "15.20.1"
 
 def load_version() -> str:
     """Carga la versión actual desde el archivo de versión."""
@@ -34,6 +85,7 @@ def load_version() -> str:
     except (FileNotFoundError, json.JSONDecodeError):
         # Si el archivo no existe o está corrupto, crea uno nuevo
         version_data = {'version': '1.0.0'}
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         with open(VERSION_FILE, 'w') as f:
             json.dump(version_data, f, indent=2)
         return '1.0.0'
@@ -53,136 +105,168 @@ def increment_version() -> str:
     new_version = '.'.join(map(str, parts))
     
     # Guardar la nueva versión
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     with open(VERSION_FILE, 'w') as f:
         json.dump({'version': new_version}, f, indent=2)
     
     return new_version
 
-def load_template(template_name: str) -> str:
-    """Carga una plantilla HTML por su nombre."""
+def load_template(template_name: str) -> CompiledTemplate:
+    """Carga y compila una plantilla HTML por su nombre (cacheada por mtime)."""
     template_path = TEMPLATES_DIR / f"{template_name}.html"
     try:
-        return template_path.read_text(encoding='utf-8')
+        return load_compiled_template(template_path)
     except FileNotFoundError:
         raise click.ClickException(f"Plantilla no encontrada: {template_name}")
 
 def load_matches_data(json_path: str) -> Dict:
-    """Carga los datos de partidas desde un archivo JSON."""
+    """Carga los datos de partidas desde un archivo JSON o NDJSON.
+
+    En NDJSON la cabecera se lee de inmediato y 'rows' es un generador que
+    lee las filas de a una, sin cargar el archivo completo en memoria.
+    """
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with stage('load'):
+            if is_ndjson(json_path):
+                header, rows = read_ndjson(json_path)
+                return dict(header, rows=rows)
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
     except FileNotFoundError:
         raise click.ClickException(f"Archivo no encontrado: {json_path}")
     except json.JSONDecodeError:
         raise click.ClickException(f"Error al decodificar el archivo JSON: {json_path}")
 
-def get_item_icon(item_id: int) -> str:
+def load_store_data(store: MatchStore, account: str, match_filter: Optional[MatchFilter] = None) -> Dict:
+    """Arma los datos de una cuenta (cabecera + generador de filas) desde la base SQLite.
+
+    ``account`` es un Riot ID (``nombre#tag``) o un PUUID ya guardado por el fetch;
+    ``match_filter`` se resuelve en la consulta (por índice).
+    """
+    found = store.account(account)
+    if found is None:
+        raise click.ClickException(f"La cuenta {account} no está en {store.path}")
+    return {
+        'version': 1,
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'platform': found['platform'],
+        'server': found['tag_line'].upper(),
+        'display_name': f"{found['game_name']}#{found['tag_line']}",
+        'summoner_name': f"{found['game_name']}-{found['tag_line']}",
+        'level': found['level'],
+        'puuid': found['puuid'],
+        'ddragon_version': found['ddragon_version'],
+        'profileIconId': found['profile_icon_id'],
+        'ranks': store.ranks(found['puuid']),
+        'rows': store.query_rows(found['puuid'], **(match_filter.store_kwargs() if match_filter else {})),
+    }
+
+def iter_matches(json_path: str) -> Iterator[Dict]:
+    """Genera las partidas de un archivo JSON o NDJSON, una por vez."""
+    data = load_matches_data(json_path)
+    yield from data.get('rows', data.get('matches', []))
+
+def get_item_icon(item_id: int, version: str = DEFAULT_DDRAGON_VERSION) -> str:
     """Obtiene la URL del ícono del ítem."""
     if item_id == 0:
         return ""
     # Usar Data Dragon para items
-    return f"https://ddragon.leagueoflegends.com/cdn/15.20.1/img/item/{item_id}.png"
+    return icon_url(version, "item", item_id)
 
-def get_champion_icon(champ_id: str) -> str:
+def get_champion_icon(champ_id: str, version: str = DEFAULT_DDRAGON_VERSION) -> str:
     """Obtiene la URL del ícono del campeón."""
-    return f"https://ddragon.leagueoflegends.com/cdn/14.20.1/img/champion/{champ_id}.png"
-def generate_html(template: str, data: Dict, template_name: str) -> str:
-    """Genera el HTML final reemplazando las variables en la plantilla."""
-    # Obtener la versión actual
-    version = load_version()
-    
-    # Inicializar el HTML
-    html = template
+    return icon_url(version, "champion", champ_id)
+
+@lru_cache(maxsize=4096)
+def item_cell_html(
+    item_id: int,
+    trinket: bool = False,
+    item_src: Optional[str] = None,
+    item_name: Optional[str] = None,
+) -> str:
+    """Fragmento HTML de la celda de un ítem (se calcula una vez por ítem y src)."""
+    title = f' title="{escape(item_name)}"' if item_name else ''
+    if trinket:
+        if item_id and int(item_id) > 0:
+            trinket_img = f'<img src="{item_src or get_item_icon(item_id)}" class="item-icon trinket" alt="Trinket {item_id}" loading="lazy">'
+            return f'<div class="item trinket" data-item-id="{item_id}"{title}>{trinket_img}</div>'
+        return '<div class="item-empty trinket"></div>'
+    if item_id and int(item_id) > 0:
+        item_img = f'<img src="{item_src or get_item_icon(item_id)}" class="item-icon" alt="Item {item_id}" loading="lazy">'
+        return f'<div class="item" data-item-id="{item_id}"{title}>{item_img}</div>'
+    return '<div class="item-empty"></div>'
+
+def _item_cell(item_id: Any, icons: Optional[IconResolver], trinket: bool = False) -> str:
+    if icons is None or not item_id or int(item_id) <= 0:
+        return item_cell_html(item_id, trinket)
+    return item_cell_html(item_id, trinket, icons.item(item_id), icons.item_name(item_id))
+
+def render_items_html(items: Any, icons: Optional[IconResolver] = None) -> str:
+    """Genera el bloque de ítems (6 ítems + trinket) de una partida."""
+    try:
+        # Si items es una lista, el índice 6 es el trinket
+        if isinstance(items, list):
+            main_items = [items[i] if i < len(items) and items[i] and items[i] > 0 else 0 for i in range(6)]
+            trinket_id = items[6] if len(items) > 6 and items[6] else 0
+        else:
+            main_items = [items.get(str(i), 0) for i in range(6)]
+            trinket_id = items.get('trinket', items.get('6', 0))
+
+        parts = ['<div class="items-container"><div class="items-row">']
+        parts.extend(_item_cell(item_id, icons) for item_id in main_items)
+        parts.append(_item_cell(trinket_id, icons, trinket=True))
+        parts.append('</div></div>')  # Cerrar items-row y items-container
+        return ''.join(parts)
+
+    except Exception as e:
+        logger.warning("Error procesando ítems: %s", e)
+        return '<div class="items-container"><div class="items-row">Error al cargar ítems</div></div>'
+
+def match_kda(match: Dict) -> str:
+    """KDA de la partida; usa kills/deaths/assists si están y si no parsea 'kda'."""
+    if all(key in match for key in ('kills', 'deaths', 'assists')):
+        kills, deaths, assists = int(match['kills']), int(match['deaths']), int(match['assists'])
+    else:
+        kda_parts = match.get('kda', '0/0/0').split('/')
+        if len(kda_parts) == 3:
+            kills, deaths, assists = map(int, kda_parts)
+        else:
+            kills, deaths, assists = 0, 0, 0
+    return f"{kills}/{deaths}/{assists}"
+
+def render_match_row(match: Dict, icons: Optional[IconResolver] = None) -> str:
+    """Genera el fragmento <tr> de una partida."""
+    # Determinar si la partida es una victoria o derrota
+    win = match.get('win', None)
+    if win is True:
+        result_class = 'victory'
+        result_text = 'Victoria'
+    elif win is False:
+        result_class = 'defeat'
+        result_text = 'Derrota'
+    else:
+        result_class = 'remake'
+        result_text = 'Remake'
     
-    # Debug: Imprimir las claves del diccionario data
-    print("Claves en los datos:", data.keys())
+    # Obtener información del campeón
+    champ_id = match.get('champ_id', '')
+    champ_name = match.get('champ', 'Desconocido')
+    if icons is not None and champ_id:
+        # Nombre visible desde champion.json si está en caché ("MonkeyKing" -> "Wukong")
+        display_name = icons.champion_name(champ_id)
+        if display_name:
+            champ_name = escape(display_name)
+    if not champ_id:
+        champ_icon = ''
+    elif icons is not None:
+        champ_icon = icons.champion(champ_id)
+    else:
+        champ_icon = get_champion_icon(champ_id, match.get('ddragon_version') or DEFAULT_DDRAGON_VERSION)
     
-    # Inicializar variables para estadísticas
-    total_matches = 0
-    wins = 0
-    matches_html = ''
+    kda = match_kda(match)
+    items_html = render_items_html(match.get('items', {}), icons)
     
-    # Procesar las partidas
-    matches_key = 'rows' if 'rows' in data else 'matches'
-    if matches_key in data and isinstance(data[matches_key], list):
-        total_matches = len(data[matches_key])
-        print(f"Se encontraron {total_matches} partidas")
-        
-        for i, match in enumerate(data[matches_key], 1):
-            if not isinstance(match, dict):
-                print(f"Advertencia: La partida {i} no es un diccionario")
-                continue
-            # Debug: Imprimir las claves de la partida
-            if i == 1:  # Solo mostrar para la primera partida
-                print(f"Claves en la partida: {match.keys()}")
-            
-            try:
-                # Determinar si la partida es una victoria o derrota
-                win = match.get('win', None)
-                if win is True:
-                    result_class = 'victory'
-                    result_text = 'Victoria'
-                    wins += 1
-                elif win is False:
-                    result_class = 'defeat'
-                    result_text = 'Derrota'
-                else:
-                    result_class = 'remake'
-                    result_text = 'Remake'
-                
-                # Obtener información del campeón
-                champ_id = match.get('champ_id', '')
-                champ_name = match.get('champ', 'Desconocido')
-                champ_icon = get_champion_icon(champ_id) if champ_id else ''
-                
-                # Obtener KDA
-                kda_str = match.get('kda', '0/0/0')
-                kda_parts = kda_str.split('/')
-                if len(kda_parts) == 3:
-                    kills, deaths, assists = map(int, kda_parts)
-                else:
-                    kills, deaths, assists = 0, 0, 0
-                kda = f"{kills}/{deaths}/{assists}"
-                
-                            # Obtener los ítems
-                items = match.get('items', {})
-                items_html = '<div class="items-container"><div class="items-row">'  # Inicializar items_html
-
-                try:
-                    # Si items es una lista, convertir a diccionario
-                    if isinstance(items, list):
-                        items_dict = {str(i): item_id for i, item_id in enumerate(items) if item_id and item_id > 0}
-                        if len(items) > 6:  # Si hay trinket
-                            items_dict['trinket'] = items[6] if len(items) > 6 and items[6] else 0
-                        items = items_dict
-
-                    # Mostrar los 6 ítems principales
-                    for i in range(6):
-                        item_id = items.get(str(i), 0)
-                        if item_id and int(item_id) > 0:
-                            item_url = get_item_icon(item_id)
-                            item_img = f'<img src="{item_url}" class="item-icon" alt="Item {item_id}" loading="lazy">'
-                            items_html += f'<div class="item" data-item-id="{item_id}">{item_img}</div>'
-                        else:
-                            items_html += '<div class="item-empty"></div>'
-
-                    # Añadir el trinket
-                    trinket_id = items.get('trinket', items.get('6', 0))
-                    if trinket_id and int(trinket_id) > 0:
-                        trinket_url = get_item_icon(trinket_id)
-                        trinket_img = f'<img src="{trinket_url}" class="item-icon trinket" alt="Trinket {trinket_id}" loading="lazy">'
-                        items_html += f'<div class="item trinket" data-item-id="{trinket_id}">{trinket_img}</div>'
-                    else:
-                        items_html += '<div class="item-empty trinket"></div>'
-
-                    items_html += '</div></div>'  # Cerrar items-row y items-container
-
-                except Exception as e:
-                    print(f"Error procesando ítems: {e}")
-                    items_html = '<div class="items-container"><div class="items-row">Error al cargar ítems</div></div>'
-                
-                            # Crear el HTML de la partida
-                match_html = f"""
+    return f"""
                 <tr class="match-row {result_class}">
                     <td class="champ-cell">
                         <img src="{champ_icon}" class="champ-icon" alt="{champ_name}" 
@@ -223,73 +307,704 @@ def generate_html(template: str, data: Dict, template_name: str) -> str:
                     </td>
                 </tr>
                 """
-                matches_html += match_html
-                
-            except Exception as e:
-                print(f"Error procesando partida {i}: {str(e)}")
+
+def write_match_rows(
+    rows: Any,
+    out: IO[str],
+    icons: Optional[IconResolver] = None,
+    columns: Optional[MatchColumns] = None,
+    fragments: Optional[FragmentCache] = None,
+) -> Dict[str, int]:
+    """Escribe los fragmentos de cada partida en ``out`` y retorna los totales.
+
+    Con ``columns`` también acumula cada fila para las estadísticas agregadas;
+    con ``fragments`` reutiliza el HTML de las filas que no cambiaron.
+    """
+    total_matches = 0
+    wins = 0
+    rendered = 0
+    for i, match in enumerate(rows, 1):
+        total_matches = i
+        if not isinstance(match, dict):
+            logger.warning("La partida %d no es un diccionario", i)
+            continue
+        if i == 1:
+            logger.debug("Claves en la partida: %s", list(match))
+
+        if match.get('win', None) is True:
+            wins += 1
+        if columns is not None:
+            columns.append(match)
+        try:
+            if fragments is not None:
+                out.write(fragments.get_or_render(match, lambda: render_match_row(match, icons)))
+            else:
+                out.write(render_match_row(match, icons))
+            rendered += 1
+        except Exception as e:
+            logger.warning("Error procesando partida %d: %s", i, e)
+    return {'total_matches': total_matches, 'wins': wins, 'rendered': rendered}
+
+def uses_timelines(template: CompiledTemplate) -> bool:
+    """Si la plantilla muestra datos de líneas de tiempo (solo entonces se leen los .tl)."""
+    from .timeline import TIMELINE_PLACEHOLDERS
+
+    return bool(template.placeholders & TIMELINE_PLACEHOLDERS)
+
+def timeline_report(data: Dict, match_ids: List[str]) -> Dict[str, str]:
+    """Placeholders de oro/xp/CS por minuto del jugador de ``data`` en esas partidas."""
+    from .timeline import TimelineStore, summarize_timelines, timeline_placeholders
+
+    with stage('render.timelines'):
+        summary = summarize_timelines(TimelineStore(TIMELINE_DIR), match_ids, data.get('puuid', ''))
+    logger.info("Líneas de tiempo: %d de %d partidas", summary['games'], len(match_ids))
+    return timeline_placeholders(summary)
+
+def _collect_match_ids(rows: Iterable[Any], match_ids: List[str]) -> Iterator[Any]:
+    for row in rows:
+        if isinstance(row, dict) and row.get('match_id'):
+            match_ids.append(row['match_id'])
+        yield row
+
+class SpooledRows:
+    """Filas ya renderizadas en el spool. Cada recorrido (un slot ``{{matches_rows}}``) las relee desde el inicio."""
+
+    def __init__(self, buffer: IO[str]):
+        self.buffer = buffer
+
+    def __iter__(self) -> Iterator[str]:
+        self.buffer.seek(0)
+        return iter(lambda: self.buffer.read(ROWS_CHUNK_SIZE), '')
+
+def make_icon_resolver(data: Dict, assets: str = 'remote', output_path: Optional[str] = None) -> IconResolver:
+    """Crea el resolvedor de íconos para la versión de Data Dragon del JSON."""
+    from .staticdata import StaticData
+    version = data.get('ddragon_version') or DEFAULT_DDRAGON_VERSION
+    store = AssetStore(DDRAGON_DIR) if assets != 'remote' else None
+    output_dir = Path(output_path).parent if output_path else None
+    # Solo lo que el fetch dejó en disco: el render no hace peticiones de datos estáticos
+    static_data = StaticData(DDRAGON_DIR, offline=True)
+    return IconResolver(version, assets, store, output_dir, static_data)
+
+def write_html(
+    template: Union[str, CompiledTemplate],
+    data: Dict,
+    template_name: str,
+    out: IO[str],
+    icons: Optional[IconResolver] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    extra: Optional[Dict[str, str]] = None,
+    version: Optional[str] = None,
+    fragments: Optional[FragmentCache] = None,
+) -> None:
+    """Genera el HTML final y lo escribe directamente en ``out``.
+
+    Las filas se renderizan de a una a un archivo temporal (en memoria hasta
+    unos MB) y se acumulan por columnas, para tener las estadísticas del
+    encabezado (``stats.compute_stats``) antes de escribir la página.
+    ``icons`` decide de dónde salen los íconos (por defecto, el CDN remoto).
+    Con ``stats`` ya calculadas (p. ej. de todas las páginas) no se recalculan;
+    ``extra`` agrega o reemplaza placeholders. ``version`` evita releer version.json.
+    ``fragments`` reutiliza las filas ya renderizadas en la corrida anterior.
+    Si la plantilla usa placeholders de líneas de tiempo (y ``extra`` no los
+    trae), se leen las de las partidas renderizadas.
+    """
+    import tempfile
+    from .stats import MatchColumns, compute_stats, stats_placeholders
+
+    if icons is None:
+        icons = make_icon_resolver(data)
+    # Obtener la versión actual
+    if version is None:
+        version = load_version()
     
-    # Calcular estadísticas generales
-    win_rate = (wins / total_matches * 100) if total_matches > 0 else 0
+    # Compilar la plantilla si llega como texto
+    if not isinstance(template, CompiledTemplate):
+        template = compile_template(template)
     
-    # Reemplazar variables en el HTML
-    replacements = {
-        '{{matches_rows}}': matches_html if matches_html else '<tr><td colspan="4">No se encontraron partidas</td></tr>',
-        '{{generated_at}}': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        '{{version}}': f'v{version}',
-        '{{template_name}}': template_name,
-        '{{total_matches}}': str(total_matches),
-        '{{win_rate}}': f'{win_rate:.1f}%',
-        '{{wins}}': str(wins),
-        '{{losses}}': str(max(0, total_matches - wins)),
-        '{{title}}': 'Estadísticas de Partidas',
-        '{{display_name}}': data.get('display_name', 'Invocador'),
-        '{{subtitle}}': f'{total_matches} partidas jugadas • {win_rate:.1f}% de victorias',
-        '{{profile_icon_id}}': str(data.get('profileIconId', 0)),
-        '{{ddragon_version}}': data.get('ddragon_version', 'latest'),
-        '{{level}}': str(data.get('level', '?')),
-        '{{server}}': data.get('server', data.get('platform', 'N/A')).upper()
+    logger.debug("Claves en los datos: %s", list(data))
+    match_ids: Optional[List[str]] = None
+    if uses_timelines(template) and not (extra and 'timeline_stats_rows' in extra):
+        match_ids = []
+
+    with tempfile.SpooledTemporaryFile(max_size=ROWS_SPOOL_MAX_BYTES, mode='w+', encoding='utf-8') as rows_buffer:
+        # Procesar las partidas (lista en JSON o generador en NDJSON)
+        totals = {'total_matches': 0, 'wins': 0, 'rendered': 0}
+        columns = MatchColumns() if stats is None else None
+        matches_key = 'rows' if 'rows' in data else 'matches'
+        if matches_key in data and not isinstance(data[matches_key], (str, dict)):
+            with stage('render.rows'):
+                rows = data[matches_key]
+                if match_ids is not None:
+                    rows = _collect_match_ids(rows, match_ids)
+                totals = write_match_rows(rows, rows_buffer, icons, columns, fragments)
+                # En modo inline, un único mapa de íconos al final de las filas
+                rows_buffer.write(icons.script_html())
+            logger.info("Se encontraron %d partidas", totals['total_matches'])
+
+        # Estadísticas agregadas (totales, por campeón/rol/ventana, rachas)
+        if stats is None:
+            with stage('render.stats'):
+                stats = compute_stats(columns)
+        total_matches = stats['games']
+        win_rate = stats['win_rate']
+        
+        if totals['rendered']:
+            # Re-iterable: una plantilla puede usar {{matches_rows}} más de una vez
+            matches_rows = SpooledRows(rows_buffer)
+        else:
+            matches_rows = '<tr><td colspan="4">No se encontraron partidas</td></tr>'
+        
+        # Reemplazar variables en el HTML
+        replacements = stats_placeholders(stats)
+        replacements.update({
+            'matches_rows': matches_rows,
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'version': f'v{version}',
+            'template_name': template_name,
+            'title': 'Estadísticas de Partidas',
+            'display_name': data.get('display_name', 'Invocador'),
+            'subtitle': f'{total_matches} partidas jugadas • {win_rate:.1f}% de victorias',
+            'profile_icon_id': str(data.get('profileIconId', 0)),
+            'profile_icon_url': icons.profile_icon(data.get('profileIconId', 0)),
+            'ddragon_version': data.get('ddragon_version', 'latest'),
+            'level': str(data.get('level', '?')),
+            'rank': escape(format_rank(data.get('ranks'), 420)),
+            'rank_flex': escape(format_rank(data.get('ranks'), 440)),
+            'server': data.get('server', data.get('platform', 'N/A')).upper(),
+            'page_nav': '',
+        })
+        if match_ids is not None:
+            replacements.update(timeline_report(data, match_ids))
+        if extra:
+            replacements.update(extra)
+        
+        missing = template.missing(replacements)
+        if missing:
+            logger.warning("Placeholders sin valor en %s: %s", template_name, ', '.join(sorted(missing)))
+
+        with stage('render.page'):
+            template.render_to(out, replacements)
+
+def page_path(output: Union[str, Path], page: int) -> Path:
+    """Ruta de la página ``page`` de una salida paginada (``salida-p2.html``)."""
+    output = Path(output)
+    return output.with_name(f"{output.stem}-p{page}{output.suffix}")
+
+def page_nav_html(output: Union[str, Path], page: int, page_count: int) -> str:
+    """Enlaces anterior / índice / siguiente de una página."""
+    links = []
+    if page > 1:
+        links.append(f'<a class="page-link" href="{page_path(output, page - 1).name}">&larr; Anterior</a>')
+    links.append(f'<a class="page-link" href="{Path(output).name}">Índice</a>')
+    links.append(f'<span class="page-current">Página {page} de {page_count}</span>')
+    if page < page_count:
+        links.append(f'<a class="page-link" href="{page_path(output, page + 1).name}">Siguiente &rarr;</a>')
+    return f'<nav class="page-nav">{"".join(links)}</nav>'
+
+def index_html(data: Dict, stats: Dict[str, Any], pages: List[Dict[str, Any]], output: Union[str, Path],
+               description: str = '') -> str:
+    """Página índice de una salida paginada: totales y un enlace por página."""
+    from .stats import stats_placeholders
+
+    placeholders = stats_placeholders(stats)
+    items = []
+    for page in pages:
+        dates = f"{page['first']} → {page['last']}" if page['count'] else ''
+        items.append(
+            f'<li><a href="{page_path(output, page["page"]).name}">Página {page["page"]}</a>'
+            f' <span>{page["count"]} partidas · {page["wins"]}V {page["count"] - page["wins"]}D</span>'
+            f' <small>{escape(dates)}</small></li>'
+        )
+    name = escape(str(data.get('display_name', 'Invocador')))
+    filters_line = f'<p class="filters">{escape(description)}</p>' if description else ''
+    rank = f"<span>{escape(format_rank(data['ranks'], 420))}</span>" if data.get('ranks') else ''
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{name} - Índice</title>
+<style>
+body{{font-family:system-ui,sans-serif;background:#0f1216;color:#e6e8eb;max-width:760px;margin:40px auto;padding:0 16px}}
+a{{color:#c8aa6e}} li{{margin:6px 0}} li span{{margin-left:8px}} li small{{margin-left:8px;color:#8a9099}}
+.summary span{{margin-right:16px}} .filters{{color:#8a9099}}
+</style>
+</head>
+<body>
+<h1>{name}</h1>
+{filters_line}
+<p class="summary"><span>{placeholders['total_matches']} partidas</span><span>{placeholders['wins']}V {placeholders['losses']}D</span><span>{placeholders['win_rate']}</span><span>KDA {placeholders['avg_kda']}</span>{rank}</p>
+<ol>
+{chr(10).join(items)}
+</ol>
+<p><small>Generado {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</small></p>
+</body>
+</html>
+"""
+
+def write_paginated_html(
+    template: Union[str, CompiledTemplate],
+    data: Dict,
+    template_name: str,
+    output: Union[str, Path],
+    rows_factory: Any,
+    page_size: int,
+    icons: Optional[IconResolver] = None,
+    description: str = '',
+    fragments: Optional[FragmentCache] = None,
+) -> List[Path]:
+    """Escribe una página HTML por cada ``page_size`` partidas más un índice en ``output``.
+
+    ``rows_factory()`` retorna un iterador nuevo de las filas (ya filtradas): una
+    pasada calcula las estadísticas de todas y otra renderiza cada página solo
+    con su porción, así el tamaño de cada archivo no crece con el historial.
+    Las páginas sobrantes de una generación anterior se borran.
+    """
+    from .stats import MatchColumns, compute_stats
+
+    if icons is None:
+        icons = make_icon_resolver(data)
+    stats = compute_stats(MatchColumns.from_rows(row for row in rows_factory() if isinstance(row, dict)))
+    page_count = max(1, -(-stats['games'] // page_size))
+    subtitle = f"{stats['games']} partidas jugadas • {stats['win_rate']:.1f}% de victorias"
+    if description:
+        subtitle += f" • {description}"
+
+    if not isinstance(template, CompiledTemplate):
+        template = compile_template(template)
+    timelines: Dict[str, str] = {}
+    if uses_timelines(template):
+        # De todas las partidas, como las estadísticas del encabezado
+        timelines = timeline_report(data, [row['match_id'] for row in rows_factory()
+                                           if isinstance(row, dict) and row.get('match_id')])
+
+    rows = (row for row in rows_factory() if isinstance(row, dict))
+    pages = []
+    written = []
+    for page in range(1, page_count + 1):
+        chunk = list(itertools.islice(rows, page_size))
+        path = page_path(output, page)
+        with open(path, 'w', encoding='utf-8') as f:
+            write_html(template, dict(data, rows=chunk), template_name, f, icons, stats=stats, extra=dict(
+                timelines,
+                page_nav=page_nav_html(output, page, page_count),
+                subtitle=subtitle,
+            ), fragments=fragments)
+        pages.append({
+            'page': page,
+            'count': len(chunk),
+            'wins': sum(1 for row in chunk if row.get('win') is True),
+            'first': chunk[0].get('game_creation', '')[:10] if chunk else '',
+            'last': chunk[-1].get('game_creation', '')[:10] if chunk else '',
+        })
+        written.append(path)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(index_html(data, stats, pages, output, description))
+    written.insert(0, Path(output))
+
+    # Páginas de una generación anterior con más partidas (o --page-size menor)
+    stale = page_count + 1
+    while page_path(output, stale).exists():
+        page_path(output, stale).unlink()
+        stale += 1
+    return written
+
+def static_data_state() -> Dict[str, Any]:
+    """Versión de respaldo de Data Dragon y datos estáticos en disco: de ellos salen íconos y nombres del render."""
+    from .staticdata import StaticData
+
+    return {'default_version': DEFAULT_DDRAGON_VERSION, 'available': StaticData(DDRAGON_DIR, offline=True).available()}
+
+def render_key(source_digest: str, template_name: str, assets: str,
+               match_filter: Optional[MatchFilter] = None, page_size: Optional[int] = None) -> str:
+    """Hash de todo lo que determina una salida: entrada, bytes de la plantilla, opciones y datos estáticos."""
+    from .manifest import RENDER_FORMAT, digest_parts, file_digest
+
+    template_path = TEMPLATES_DIR / f"{template_name}.html"
+    options = {
+        'assets': assets,
+        'filters': (match_filter or MatchFilter()).store_kwargs(),
+        'page_size': page_size,
+        'static_data': static_data_state(),
     }
-    
-    for placeholder, value in replacements.items():
-        html = html.replace(placeholder, value)
-    
-    return html
+    return digest_parts(RENDER_FORMAT, source_digest, file_digest(template_path), template_name, options)
+
+def fragment_cache(output: Union[str, Path], icons: IconResolver) -> Optional[FragmentCache]:
+    """Caché de filas de una salida (no en modo inline: ahí cada fila registra sus íconos)."""
+    from .manifest import FragmentCache, digest_parts
+
+    if icons.mode == 'inline':
+        return None
+    path = FRAGMENTS_DIR / f"{digest_parts(str(Path(output).resolve()))}.json"
+    return FragmentCache(path, context=(icons.mode, icons.version, str(icons.output_dir.resolve()), static_data_state()))
+
+def generate_html(
+    template: Union[str, CompiledTemplate],
+    data: Dict,
+    template_name: str,
+    icons: Optional[IconResolver] = None,
+) -> str:
+    """Genera el HTML final reemplazando las variables en la plantilla."""
+    buffer = io.StringIO()
+    write_html(template, data, template_name, buffer, icons)
+    return buffer.getvalue()
+
+def queue_option(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[int]:
+    """Callback de --queue: acepta el id de la cola o su nombre corto (solo, flex, aram...)."""
+    try:
+        return parse_queue(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
 
 @cli.command()
 @click.option('--read-json', type=click.Path(exists=True), help='Ruta al archivo JSON con datos de partidas')
 @click.option('--html-template', default='default', help='Nombre de la plantilla HTML a utilizar')
 @click.option('--output', '-o', help='Ruta de salida para el archivo HTML')
-def generate(read_json: str, html_template: str, output: Optional[str]):
+@click.option('--assets', type=click.Choice(ASSET_MODES), default='remote', show_default=True,
+              help='Íconos: CDN remoto, copia local en data/ddragon o inline (HTML offline)')
+@click.option('--store', 'store_path', type=click.Path(dir_okay=False), default=None,
+              help='Lee las partidas de la base SQLite del fetch (por defecto data/cache/matches.db)')
+@click.option('--account', help='Riot ID (nombre#tag) o PUUID a generar desde --store')
+@click.option('--champion', help='Solo partidas con este campeón (p. ej. Lux)')
+@click.option('--result', type=click.Choice(RESULTS), help='Solo victorias o solo derrotas')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), help='Desde esta fecha (AAAA-MM-DD)')
+@click.option('--until', type=click.DateTime(formats=['%Y-%m-%d']), help='Hasta esta fecha inclusive (AAAA-MM-DD)')
+@click.option('--queue', callback=queue_option,
+              help=f"Id de cola (420 = Solo/Duo, 440 = Flex, 450 = ARAM) o nombre: {', '.join(QUEUES)}")
+@click.option('--page-size', type=click.IntRange(min=1),
+              help='Partidas por página: genera una página por porción y un índice en --output')
+@click.option('--force', is_flag=True, help='Regenera aunque la entrada, la plantilla y las opciones no hayan cambiado')
+@profile_options
+def generate(read_json: str, html_template: str, output: Optional[str], assets: str,
+             store_path: Optional[str], account: Optional[str], champion: Optional[str],
+             result: Optional[str], since: Optional[datetime], until: Optional[datetime],
+             queue: Optional[int], page_size: Optional[int], force: bool):
     """Genera un archivo HTML con estadísticas de partidas."""
+    from .manifest import RenderManifest, digest_parts, file_digest, rows_digest
+    from .store import MatchStore
+
+    if not read_json and not account:
+        raise click.UsageError("Indica --read-json o --account (con --store)")
+    match_filter = MatchFilter(champion, result, since, until, queue)
+    store = None
     try:
-        # Incrementar versión automáticamente
-        new_version = increment_version()
-        click.echo(f"📦 Versión incrementada a: v{new_version}")
-        
         # Cargar plantilla
         template = load_template(html_template)
         
-        # Cargar datos de partidas
-        matches_data = load_matches_data(read_json)
-        
-        # Generar HTML
-        html_content = generate_html(template, matches_data, html_template)
+        # Cargar datos de partidas (archivo JSON/NDJSON o consulta a la base)
+        if account:
+            store_path = store_path or str(MATCH_STORE)
+            if not Path(store_path).exists():
+                raise click.ClickException(f"No existe la base de partidas: {store_path}")
+            store = MatchStore(store_path)
+            matches_data = load_store_data(store, account, match_filter)
+            puuid = matches_data['puuid']
+
+            def fresh_rows() -> Iterator[Dict]:
+                return store.query_rows(puuid, **match_filter.store_kwargs())
+
+            header = {key: value for key, value in matches_data.items() if key not in ('rows', 'generated_at')}
+            with stage('manifest.digest'):
+                source_digest = digest_parts(header, rows_digest(fresh_rows()))
+        else:
+            matches_data = load_matches_data(read_json)
+            source = matches_data.get('rows', matches_data.get('matches', []))
+            if isinstance(source, (str, dict)):
+                source = []
+
+            def fresh_rows() -> Iterator[Dict]:
+                # Una lista se reutiliza; un generador NDJSON se consume una vez y luego se relee
+                nonlocal source
+                rows, source = source, (source if isinstance(source, list) else None)
+                return match_filter.apply(rows if rows is not None else iter_matches(read_json))
+
+            if match_filter.queue is not None:
+                first = next(iter(source if isinstance(source, list) else iter_matches(read_json)), None)
+                if isinstance(first, dict) and 'queue_id' not in first:
+                    raise click.ClickException(
+                        f"Las filas de {read_json} no tienen queue_id y no se pueden filtrar por cola: "
+                        "vuelve a descargarlas con fetch_matches_full.py"
+                    )
+            if match_filter:
+                matches_data['rows'] = fresh_rows()
+            with stage('manifest.digest'):
+                source_digest = file_digest(read_json)
         
         # Determinar la ruta de salida
         if not output:
-            output_dir = OUTPUT_DIR / html_template
-            output_dir.mkdir(exist_ok=True)
-            output = str(output_dir / f"{matches_data.get('summoner_name', 'output')}-{html_template}.html")
+            output = str(OUTPUT_DIR / html_template / f"{matches_data.get('summoner_name', 'output')}-{html_template}.html")
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
         
-        # Guardar el archivo HTML
-        with open(output, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        click.echo(f"✅ Archivo generado exitosamente: {click.format_filename(output)}")
+        # Saltear si nada cambió desde la última generación de esta salida
+        manifest = RenderManifest(RENDER_MANIFEST)
+        key = render_key(source_digest, html_template, assets, match_filter, page_size)
+        if not force and manifest.is_current(output, key):
+            click.echo(f"⏭️  Sin cambios, se conserva: {click.format_filename(output)}")
+            return
+
+        # Incrementar versión automáticamente
+        new_version = increment_version()
+        click.echo(f"📦 Versión incrementada a: v{new_version}")
+
+        # Generar el HTML escribiéndolo directamente en el archivo
+        icons = make_icon_resolver(matches_data, assets, output)
+        fragments = fragment_cache(output, icons) if not force else None
+        if page_size:
+            written = write_paginated_html(template, matches_data, html_template, output, fresh_rows,
+                                           page_size, icons, match_filter.describe(), fragments)
+            click.echo(f"✅ {len(written) - 1} páginas generadas; índice: {click.format_filename(output)}")
+        else:
+            extra = None
+            if match_filter:
+                extra = {'title': f"Estadísticas de Partidas · {match_filter.describe()}"}
+            with open(output, 'w', encoding='utf-8') as f:
+                write_html(template, matches_data, html_template, f, icons, extra=extra, fragments=fragments)
+            written = [Path(output)]
+
+            click.echo(f"✅ Archivo generado exitosamente: {click.format_filename(output)}")
+
+        if fragments is not None:
+            fragments.save()
+            click.echo(f"♻️  Filas reutilizadas: {fragments.hits}, renderizadas: {fragments.misses}")
+        if match_filter.rows_without_queue:
+            click.echo("⚠️  Se omitieron partidas sin queue_id (descargadas con una versión anterior); "
+                       "vuelve a descargarlas con fetch_matches_full.py para incluirlas", err=True)
+        manifest.record(output, key, written)
+        manifest.save()
         
     except Exception as e:
         click.echo(f"❌ Error: {str(e)}", err=True)
         raise click.Abort()
+    finally:
+        if store is not None:
+            store.close()
+
+# Estado de cada proceso de generate-batch: plantillas compiladas y versión del lote
+_BATCH_TEMPLATES: Dict[str, CompiledTemplate] = {}
+_BATCH_VERSION: Optional[str] = None
+
+def _init_batch_worker(template_names: List[str], version: str) -> None:
+    """Inicializa un proceso de generate-batch: compila cada plantilla una sola vez."""
+    global _BATCH_VERSION
+    _BATCH_VERSION = version
+    for name in template_names:
+        _BATCH_TEMPLATES[name] = load_template(name)
+
+def batch_output_path(output_dir: Union[str, Path], read_json: str, template_name: str) -> Path:
+    """``<output_dir>/<plantilla>/<nombre del JSON>-<plantilla>.html``."""
+    return Path(output_dir) / template_name / f"{Path(read_json).stem}-{template_name}.html"
+
+def batch_outputs(output_dir: Union[str, Path], inputs: List[str], template_names: List[str]) -> Dict[tuple, str]:
+    """Salida de cada (JSON, plantilla) de ``generate-batch``/``watch``.
+
+    Dos JSON con el mismo nombre en carpetas distintas irían al mismo HTML y
+    uno pisaría al otro: en ese caso se corta con un error de uso.
+    """
+    outputs: Dict[tuple, str] = {}
+    owners: Dict[Path, str] = {}
+    for read_json in inputs:
+        for name in template_names:
+            output = batch_output_path(output_dir, read_json, name)
+            owner = owners.setdefault(output.resolve(), read_json)
+            if Path(owner).resolve() != Path(read_json).resolve():
+                raise click.UsageError(
+                    f"{owner} y {read_json} generarían el mismo archivo ({output}); "
+                    "renombra uno de los JSON o genéralos por separado con --output-dir distintos"
+                )
+            outputs[(read_json, name)] = str(output)
+    return outputs
+
+def _render_batch_job(read_json: str, template_name: str, output: str, assets: str,
+                      use_fragments: bool = True) -> Dict[str, Any]:
+    """Renderiza una combinación (JSON, plantilla) dentro de un proceso del pool."""
+    started = time.perf_counter()
+    template = _BATCH_TEMPLATES.get(template_name) or load_template(template_name)
+    data = load_matches_data(read_json)
+    icons = make_icon_resolver(data, assets, output)
+    fragments = fragment_cache(output, icons) if use_fragments else None
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        write_html(template, data, template_name, f, icons, version=_BATCH_VERSION, fragments=fragments)
+    if fragments is not None:
+        fragments.save()
+    return {'output': output, 'seconds': time.perf_counter() - started}
+
+@cli.command('generate-batch')
+@click.option('--read-json', 'inputs', multiple=True, required=True, type=click.Path(exists=True, dir_okay=False),
+              help='JSON/NDJSON de entrada (repetible)')
+@click.option('--html-template', 'template_names', multiple=True, default=('claude-4-5',), show_default=True,
+              help='Plantilla a usar (repetible)')
+@click.option('--output-dir', type=click.Path(file_okay=False), default=None,
+              help='Directorio de salida (por defecto outputs/)')
+@click.option('--assets', type=click.Choice(ASSET_MODES), default='remote', show_default=True,
+              help='Íconos: CDN remoto, copia local en data/ddragon o inline (HTML offline)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='Procesos en paralelo (por defecto, uno por CPU)')
+@click.option('--force', is_flag=True, help='Regenera también los archivos sin cambios')
+def generate_batch(inputs: List[str], template_names: List[str], output_dir: Optional[str], assets: str,
+                   jobs: Optional[int], force: bool):
+    """Genera los HTML de varios JSON con varias plantillas en un pool de procesos.
+
+    La versión se incrementa una sola vez para todo el lote y cada proceso
+    compila las plantillas una vez, aunque renderice muchos archivos. Las
+    combinaciones cuya entrada, plantilla y opciones no cambiaron se saltean.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from .manifest import RenderManifest, file_digest
+
+    # Validar las plantillas antes de arrancar los procesos
+    for name in template_names:
+        load_template(name)
+
+    output_dir = output_dir or str(OUTPUT_DIR)
+    manifest = RenderManifest(RENDER_MANIFEST)
+    outputs = batch_outputs(output_dir, inputs, template_names)
+    source_digests = {read_json: file_digest(read_json) for read_json in inputs}
+    combos, keys = [], {}
+    for (read_json, name), output in outputs.items():
+        if output in keys:
+            continue  # El mismo JSON pasado dos veces
+        keys[output] = render_key(source_digests[read_json], name, assets)
+        if not force and manifest.is_current(output, keys[output]):
+            click.echo(f"⏭️  Sin cambios, se conserva: {click.format_filename(output)}")
+            continue
+        combos.append((read_json, name, output, assets, not force))
+    if not combos:
+        click.echo("✅ Nada que regenerar")
+        return
+
+    new_version = increment_version()
+    click.echo(f"📦 Versión incrementada a: v{new_version}")
+    workers = min(jobs or os.cpu_count() or 1, len(combos))
+    started = time.perf_counter()
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(list(template_names), new_version)) as executor:
+        futures = {executor.submit(_render_batch_job, *combo): combo for combo in combos}
+        for future in as_completed(futures):
+            read_json, name, output = futures[future][:3]
+            try:
+                result = future.result()
+                manifest.record(output, keys[output])
+                click.echo(f"✅ {click.format_filename(output)} ({result['seconds']:.2f}s)")
+            except Exception as e:
+                failures += 1
+                click.echo(f"❌ {read_json} + {name}: {e}", err=True)
+
+    manifest.save()
+    elapsed = time.perf_counter() - started
+    click.echo(f"📊 {len(combos) - failures}/{len(combos)} archivos en {elapsed:.2f}s con {workers} procesos")
+    if failures:
+        raise click.Abort()
+
+def _watch_render(data: Dict, read_json: str, template_name: str, output: str, assets: str,
+                  fragments: Dict[str, Optional[FragmentCache]], manifest: RenderManifest) -> None:
+    """Renderiza una salida de ``cli watch`` con los datos ya cargados en memoria."""
+    from .manifest import file_digest
+
+    template = load_template(template_name)
+    icons = make_icon_resolver(data, assets, output)
+    if output not in fragments:
+        fragments[output] = fragment_cache(output, icons)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        write_html(template, data, template_name, f, icons, fragments=fragments[output])
+    if fragments[output] is not None:
+        fragments[output].save()
+    manifest.record(output, render_key(file_digest(read_json), template_name, assets))
+    manifest.save()
+
+@cli.command()
+@click.option('--read-json', 'inputs', multiple=True, type=click.Path(dir_okay=False),
+              default=(str(CACHE_DIR / 'matches.json'),), show_default=True,
+              help='JSON/NDJSON a vigilar (repetible)')
+@click.option('--html-template', 'template_names', multiple=True, default=('claude-4-5',), show_default=True,
+              help='Plantilla a vigilar (repetible)')
+@click.option('--output', '-o', help='Ruta de salida (solo con un JSON y una plantilla)')
+@click.option('--output-dir', type=click.Path(file_okay=False), default=None,
+              help='Directorio de salida (por defecto outputs/)')
+@click.option('--assets', type=click.Choice(ASSET_MODES), default='remote', show_default=True,
+              help='Íconos: CDN remoto, copia local en data/ddragon o inline (HTML offline)')
+@click.option('--interval', type=click.FloatRange(min=0.01), default=0.25, show_default=True,
+              help='Segundos entre sondeos de los archivos')
+@click.option('--debounce', type=click.FloatRange(min=0), default=0.2, show_default=True,
+              help='Segundos sin cambios antes de regenerar (agrupa ráfagas de guardados)')
+def watch(inputs: List[str], template_names: List[str], output: Optional[str], output_dir: Optional[str],
+          assets: str, interval: float, debounce: float):
+    """Regenera los HTML cada vez que cambian los JSON de entrada o las plantillas.
+
+    Los datos y las plantillas compiladas quedan en memoria entre corridas:
+    al editar una plantilla se re-renderizan solo sus salidas (sin releer los
+    JSON) y al cambiar un JSON, solo las salidas de ese JSON. La versión no se
+    incrementa en cada guardado; se usa la de config/version.json.
+    """
+    from .manifest import RenderManifest
+    from .watch import FileWatcher
+
+    if output and (len(inputs) > 1 or len(template_names) > 1):
+        raise click.UsageError("--output solo se puede usar con un --read-json y una --html-template")
+    for name in template_names:
+        load_template(name)
+
+    output_dir = output_dir or str(OUTPUT_DIR)
+    if output:
+        outputs = {(inputs[0], template_names[0]): output}
+    else:
+        outputs = batch_outputs(output_dir, inputs, template_names)
+    template_paths = {TEMPLATES_DIR / f"{name}.html": name for name in template_names}
+    input_paths = {Path(read_json): read_json for read_json in inputs}
+    watcher = FileWatcher(list(template_paths) + list(input_paths), interval, debounce)
+
+    data_cache: Dict[str, Dict] = {}
+    fragments: Dict[str, Optional[FragmentCache]] = {}
+    manifest = RenderManifest(RENDER_MANIFEST)
+
+    def load_data(read_json: str) -> Dict:
+        data = load_matches_data(read_json)
+        for key in ('rows', 'matches'):
+            # En NDJSON 'rows' es un generador: se materializa para reutilizarlo
+            if key in data and not isinstance(data[key], (list, str, dict)):
+                data[key] = list(data[key])
+        data_cache[read_json] = data
+        return data
+
+    def render(combos: List[tuple]) -> None:
+        started = time.perf_counter()
+        failures = 0
+        for read_json, name in combos:
+            target = outputs[(read_json, name)]
+            try:
+                data = data_cache.get(read_json) or load_data(read_json)
+                _watch_render(data, read_json, name, target, assets, fragments, manifest)
+            except Exception as e:
+                # Un guardado a medias o un JSON inválido no corta el modo watch
+                failures += 1
+                click.echo(f"❌ {click.format_filename(target)}: {e}", err=True)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if len(combos) > failures:
+            click.echo(f"✅ {len(combos) - failures} archivo(s) regenerado(s) en {elapsed_ms:.0f} ms")
+        if failures:
+            click.echo(f"⚠️  {failures}/{len(combos)} archivo(s) con errores; se reintenta en el próximo cambio", err=True)
+
+    render(list(outputs))
+    click.echo(f"👀 Vigilando {len(watcher.paths)} archivo(s) (Ctrl+C para salir)")
+    try:
+        while True:
+            changed = watcher.wait()
+            stale = set()
+            for path in changed:
+                if path in input_paths:
+                    read_json = input_paths[path]
+                    data_cache.pop(read_json, None)
+                    stale.update((read_json, name) for name in template_names)
+                else:
+                    stale.update((read_json, template_paths[path]) for read_json in inputs)
+            if stale:
+                click.echo(f"🔄 Cambios en: {', '.join(sorted(path.name for path in changed))}")
+                render(sorted(stale))
+    except KeyboardInterrupt:
+        click.echo("👋 Fin del modo watch")
 
 @cli.command()
 def version():
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+RESULTS = ("win", "loss")
+
+# Colas de Match-V5 por nombre corto (también se acepta el id numérico)
+QUEUES = {
+    "solo": 420,   # Ranked Solo/Duo
+    "flex": 440,   # Ranked Flex
+    "draft": 400,  # Normal reclutamiento
+    "blind": 430,  # Normal a ciegas
+    "quickplay": 490,
+    "aram": 450,
+    "arena": 1700,
+}
+
+# Valores del parámetro ``type`` de Match-V5 (ids por PUUID)
+MATCH_TYPES = ("ranked", "normal", "tourney", "tutorial")
+
+
+def parse_queue(value: Any) -> Optional[int]:
+    """Id de cola a partir de un id (``420``) o un nombre de ``QUEUES`` (``solo``)."""
+    if value is None or isinstance(value, int):
+        return value
+    text = str(value).strip().lower()
+    if text in QUEUES:
+        return QUEUES[text]
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Cola no soportada: {value}. Usa un id numérico o uno de: {', '.join(QUEUES)}")
+
+
+class MatchFilter:
+    """
+    Filtros de ``cli generate`` sobre las filas de matches.json.
+
+    - ``champion``: nombre del campeón (sin distinguir mayúsculas).
+    - ``result``: ``win`` o ``loss``.
+    - ``since`` / ``until``: fechas de inicio y fin (``until`` incluye todo ese día).
+    - ``queue``: id de cola de Match-V5 (420 = Ranked Solo/Duo). Las filas
+      descargadas antes de que existiera ``queue_id`` no pasan el filtro y
+      quedan contadas en ``rows_without_queue``.
+
+    Con archivos JSON/NDJSON se aplica fila a fila (``apply``); con la base
+    SQLite se traduce a la consulta indexada (``store_kwargs``).
+    """
+
+    def __init__(
+        self,
+        champion: Optional[str] = None,
+        result: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        queue: Optional[int] = None,
+    ):
+        if result is not None and result not in RESULTS:
+            raise ValueError(f"Resultado no soportado: {result}. Usa uno de: {', '.join(RESULTS)}")
+        self.champion = champion
+        self.result = result
+        self.since = since
+        # Fecha sin hora: se incluye el día completo
+        if until is not None and until.time() == datetime.min.time():
+            until = until + timedelta(days=1)
+        self.until = until
+        self.queue = queue
+        self.rows_without_queue = 0
+        self._champion_key = champion.lower() if champion else None
+
+    def __bool__(self) -> bool:
+        return any(value is not None for value in (self.champion, self.result, self.since, self.until, self.queue))
+
+    def matches(self, row: Dict[str, Any]) -> bool:
+        if self._champion_key is not None and str(row.get("champ", "")).lower() != self._champion_key:
+            return False
+        if self.result is not None and (row.get("win") is True) != (self.result == "win"):
+            return False
+        if self.queue is not None and row.get("queue_id") != self.queue:
+            if "queue_id" not in row:
+                self.rows_without_queue += 1
+            return False
+        if self.since is not None or self.until is not None:
+            try:
+                created = datetime.fromisoformat(str(row.get("game_creation")))
+            except ValueError:
+                return False
+            if self.since is not None and created < self.since:
+                return False
+            if self.until is not None and created >= self.until:
+                return False
+        return True
+
+    def apply(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        if not self:
+            yield from rows
+            return
+        for row in rows:
+            if isinstance(row, dict) and self.matches(row):
+                yield row
+
+    def store_kwargs(self) -> Dict[str, Any]:
+        """Argumentos equivalentes para ``MatchStore.query_rows``."""
+        return {
+            "champion": self.champion,
+            "win": None if self.result is None else self.result == "win",
+            "since": self.since,
+            "until": self.until,
+            "queue": self.queue,
+        }
+
+    def describe(self) -> str:
+        """Resumen legible de los filtros activos (vacío si no hay)."""
+        parts = []
+        if self.champion:
+            parts.append(self.champion)
+        if self.result:
+            parts.append("Victorias" if self.result == "win" else "Derrotas")
+        if self.queue is not None:
+            parts.append(f"Cola {self.queue}")
+        if self.since is not None:
+            parts.append(f"desde {self.since:%Y-%m-%d}")
+        if self.until is not None:
+            parts.append(f"hasta {self.until - timedelta(seconds=1):%Y-%m-%d}")
+        return " · ".join(parts)
+
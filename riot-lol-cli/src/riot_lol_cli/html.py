@@ -1,23 +1,118 @@
 from __future__ import annotations
 
+import logging
 import os
+import re
 from pathlib import Path
-from typing import Dict
+from typing import IO, Any, Dict, Iterable, List, Mapping, Set, Tuple
 
 
+logger = logging.getLogger(__name__)
+
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+# Placeholders de llaves dobles {{key}} (sin espacios, igual que el reemplazo original)
+PLACEHOLDER_RE = re.compile(r"\{\{([A-Za-z_][A-Za-z0-9_]*)\}\}")
+
+
+class TemplateError(KeyError):
+    pass
+
+
+class CompiledTemplate:
+    """
+    Plantilla parseada una sola vez en segmentos literales y slots {{key}}.
+    Renderizar es un único join, en lugar de un str.replace por cada clave.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._segments: List[str] = []
+        self._slots: List[Tuple[int, str]] = []
+        pos = 0
+        for match in PLACEHOLDER_RE.finditer(source):
+            self._segments.append(source[pos:match.start()])
+            self._slots.append((len(self._segments), match.group(1)))
+            # El slot conserva el texto original por si queda sin valor
+            self._segments.append(match.group(0))
+            pos = match.end()
+        self._segments.append(source[pos:])
+        self.placeholders: Set[str] = {key for _, key in self._slots}
+
+    def missing(self, values: Mapping[str, Any]) -> Set[str]:
+        """Placeholders de la plantilla que no tienen valor."""
+        return self.placeholders - set(values)
+
+    def unused(self, values: Mapping[str, Any]) -> Set[str]:
+        """Claves provistas que la plantilla no usa."""
+        return set(values) - self.placeholders
+
+    def render(self, values: Mapping[str, Any], strict: bool = False) -> str:
+        """
+        Rellena los slots con ``values``. Los placeholders sin valor quedan tal
+        cual en la salida, salvo con ``strict=True``, que lanza TemplateError.
+        """
+        if strict:
+            missing = self.missing(values)
+            if missing:
+                raise TemplateError(f"Placeholders sin valor: {', '.join(sorted(missing))}")
+        parts = list(self._segments)
+        for index, key in self._slots:
+            if key in values:
+                parts[index] = str(values[key])
+        return "".join(parts)
+
+    def render_to(self, out: IO[str], values: Mapping[str, Any]) -> None:
+        """
+        Escribe la plantilla en ``out`` segmento a segmento. Un valor que sea un
+        iterable de strings (no un str) se vuelca por partes, sin unirlo en memoria;
+        se recorre una vez por slot, así que si el placeholder se repite debe poder
+        recorrerse de nuevo (no un generador).
+        """
+        slots = dict(self._slots)
+        for index, segment in enumerate(self._segments):
+            key = slots.get(index)
+            if key is None or key not in values:
+                out.write(segment)
+                continue
+            value = values[key]
+            if isinstance(value, str) or not isinstance(value, Iterable):
+                out.write(str(value))
+            else:
+                for chunk in value:
+                    out.write(chunk)
+
+
+# Caché de plantillas compiladas: ruta -> (mtime_ns, plantilla)
+_COMPILED_CACHE: Dict[Path, Tuple[int, CompiledTemplate]] = {}
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    return CompiledTemplate(source)
+
+
+def load_compiled_template(template_path: Path) -> CompiledTemplate:
+    """Compila una plantilla desde disco, reutilizándola mientras no cambie su mtime."""
+    template_path = Path(template_path)
+    mtime = os.stat(template_path).st_mtime_ns
+    cached = _COMPILED_CACHE.get(template_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    compiled = compile_template(template_path.read_text(encoding="utf-8"))
+    _COMPILED_CACHE[template_path] = (mtime, compiled)
+    return compiled
+
 
 def ensure_out_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def render_template(template_name: str, placeholders: Dict[str, str]) -> str:
+def render_template(template_name: str, placeholders: Dict[str, str], strict: bool = False) -> str:
     template_path = TEMPLATES_DIR / f"{template_name}.html"
     if not template_path.exists():
         raise FileNotFoundError(f"Plantilla no encontrada: {template_path}")
-    html = template_path.read_text(encoding="utf-8")
-    # Reemplazo simple de llaves dobles {{key}}
-    for k, v in placeholders.items():
-        html = html.replace(f"{{{{{k}}}}}", str(v))
-    return html
+    template = load_compiled_template(template_path)
+    missing = template.missing(placeholders)
+    if missing and not strict:
+        logger.warning("Placeholders sin valor en %s: %s", template_name, ", ".join(sorted(missing)))
+    return template.render(placeholders, strict=strict)
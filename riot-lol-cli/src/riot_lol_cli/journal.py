@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Registros escritos entre fsync (cada línea igual se vuelca al SO apenas se escribe)
+FSYNC_EVERY = 20
+
+
+class FetchJournal:
+    """
+    Journal de un trabajo de fetch, para retomarlo si se corta (key vencida,
+    error de red, Ctrl+C).
+
+    Es un archivo NDJSON de solo agregado: cada línea es un registro completo
+    (``account``, ``ids`` o ``match``) que se escribe y se vuelca apenas ocurre.
+    Si el proceso muere a mitad de una línea, esa línea se ignora al leer, así
+    que el journal siempre refleja trabajo terminado. La primera línea guarda
+    la clave del trabajo: solo se retoma un journal con la misma clave.
+
+    - ``account``: cuenta resuelta (PUUID, nivel, ícono) por Riot ID.
+    - ``ids``: ids listados de una cuenta (la lista completa).
+    - ``match``: resultado ya extraído de una partida (filas), o null si el
+      jugador no estaba en ella.
+    """
+
+    def __init__(self, path: Union[str, Path], key: str, resume: bool = False):
+        self.path = Path(path)
+        self.key = key
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, Dict[str, Any]] = {}
+        self._ids: Dict[str, List[str]] = {}
+        self._matches: Dict[str, Any] = {}
+        self._unsynced = 0
+        self.failed = 0
+        self.resumed = resume and self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.resumed:
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._append({"type": "job", "key": key, "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+    def _load(self) -> bool:
+        """Lee un journal previo con la misma clave. Retorna False si no hay nada que retomar."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        records = []
+        valid = 0  # Bytes de las líneas completas y legibles
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Línea cortada por una interrupción: se descarta
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            valid += len(line)
+        if not records or records[0].get("type") != "job" or records[0].get("key") != self.key:
+            return False
+        for record in records[1:]:
+            kind = record.get("type")
+            if kind == "account":
+                self._accounts[record["riot_id"]] = record["account"]
+            elif kind == "ids":
+                self._ids[record["puuid"]] = record["ids"]
+            elif kind == "match":
+                self._matches[record["match_id"]] = record["result"]
+        # Se corta solo la cola inválida, para seguir agregando a continuación:
+        # reescribir el archivo entero perdería el journal si el proceso muere a mitad
+        if valid < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid)
+                os.fsync(f.fileno())
+        return True
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_EVERY:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    # --- cuentas ---------------------------------------------------------------
+
+    def account(self, riot_id: str) -> Optional[Dict[str, Any]]:
+        return self._accounts.get(riot_id.lower())
+
+    def record_account(self, riot_id: str, account: Dict[str, Any]) -> None:
+        self._accounts[riot_id.lower()] = account
+        self._append({"type": "account", "riot_id": riot_id.lower(), "account": account})
+
+    # --- ids listados ------------------------------------------------------------
+
+    def listed_ids(self, puuid: str) -> Optional[List[str]]:
+        return self._ids.get(puuid)
+
+    def record_ids(self, puuid: str, ids: List[str]) -> None:
+        self._ids[puuid] = list(ids)
+        self._append({"type": "ids", "puuid": puuid, "ids": self._ids[puuid]})
+
+    # --- partidas -----------------------------------------------------------------
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._matches
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def result(self, match_id: str) -> Any:
+        return self._matches.get(match_id)
+
+    def record_match(self, match_id: str, result: Any) -> None:
+        with self._lock:
+            self._matches[match_id] = result
+        self._append({"type": "match", "match_id": match_id, "result": result})
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+    # --- cierre ----------------------------------------------------------------------
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def finish(self) -> None:
+        """Cierra y borra el journal: el trabajo terminó sin partidas pendientes."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
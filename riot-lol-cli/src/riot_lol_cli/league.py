@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+# queueType de League-V4 -> id de cola de Match-V5
+RANKED_QUEUES = {
+    "RANKED_SOLO_5x5": 420,
+    "RANKED_FLEX_SR": 440,
+}
+
+TIERS = {
+    "IRON": "Hierro",
+    "BRONZE": "Bronce",
+    "SILVER": "Plata",
+    "GOLD": "Oro",
+    "PLATINUM": "Platino",
+    "EMERALD": "Esmeralda",
+    "DIAMOND": "Diamante",
+    "MASTER": "Maestro",
+    "GRANDMASTER": "Gran Maestro",
+    "CHALLENGER": "Retador",
+}
+
+# Los tiers de ápice no tienen división
+APEX_TIERS = ("MASTER", "GRANDMASTER", "CHALLENGER")
+
+
+def rank_snapshot(entries: Iterable[Dict[str, Any]], taken_at: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Foto del rango de una cuenta a partir de las entradas de League-V4.
+
+    Se guarda en la cabecera de matches.json y en la base SQLite con la fecha
+    en que se tomó: el rango cambia con cada partida clasificatoria, así que
+    es un dato de la corrida y no de una partida.
+    """
+    snapshot = []
+    for entry in entries:
+        queue_type = entry.get("queueType")
+        snapshot.append({
+            "queue_type": queue_type,
+            "queue_id": RANKED_QUEUES.get(queue_type),
+            "tier": entry.get("tier"),
+            "division": entry.get("rank"),
+            "lp": entry.get("leaguePoints", 0),
+            "wins": entry.get("wins", 0),
+            "losses": entry.get("losses", 0),
+        })
+    return {
+        "taken_at": (taken_at or datetime.now()).strftime("%Y-%m-%d %H:%M"),
+        "entries": snapshot,
+    }
+
+
+def rank_entry(ranks: Optional[Dict[str, Any]], queue_id: int = 420) -> Optional[Dict[str, Any]]:
+    """Entrada de una cola en una foto de ``rank_snapshot`` (None si no está clasificado)."""
+    for entry in (ranks or {}).get("entries", []):
+        if entry.get("queue_id") == queue_id:
+            return entry
+    return None
+
+
+def format_rank(ranks: Optional[Dict[str, Any]], queue_id: int = 420) -> str:
+    """Rango legible de una cola, p. ej. ``Oro II · 54 LP (30V 25D)``."""
+    entry = rank_entry(ranks, queue_id)
+    if entry is None or not entry.get("tier"):
+        return "Sin clasificar"
+    tier = str(entry["tier"]).upper()
+    name = TIERS.get(tier, tier.title())
+    if tier not in APEX_TIERS and entry.get("division"):
+        name = f"{name} {entry['division']}"
+    return f"{name} · {entry['lp']} LP ({entry['wins']}V {entry['losses']}D)"
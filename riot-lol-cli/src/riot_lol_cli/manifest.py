@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .rows import atomic_write
+
+# Cambiar cuando cambie el HTML que genera el código (invalida manifiesto y fragmentos)
+RENDER_FORMAT = "1"
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Hash del contenido de un archivo, leído por bloques."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def digest_parts(*parts: Any) -> str:
+    """Hash estable de varios valores JSON-serializables (opciones de render, hashes, etc.)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def rows_digest(rows: Iterable[Any]) -> str:
+    """Hash de una secuencia de filas (p. ej. el resultado de una consulta a la base)."""
+    digest = hashlib.blake2b(digest_size=20)
+    for row in rows:
+        digest.update(row.encode("utf-8") if isinstance(row, str) else json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _write_json(path: Path, data: Any) -> None:
+    with atomic_write(path) as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+class RenderManifest:
+    """
+    Registro de lo último que se renderizó en cada salida: el hash de la entrada,
+    de la plantilla y de las opciones, y los archivos que se escribieron.
+
+    Si al volver a generar el hash coincide y los archivos siguen ahí, no hace
+    falta renderizar (ni incrementar la versión).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict[str, Any]] = _read_json(self.path) or {}
+
+    @staticmethod
+    def _key(output: Union[str, Path]) -> str:
+        return str(Path(output).resolve())
+
+    def is_current(self, output: Union[str, Path], key: str) -> bool:
+        entry = self._entries.get(self._key(output))
+        if not entry or entry.get("key") != key:
+            return False
+        return all(Path(path).exists() for path in entry.get("files", [str(output)]))
+
+    def record(self, output: Union[str, Path], key: str, files: Optional[List[Union[str, Path]]] = None) -> None:
+        self._entries[self._key(output)] = {
+            "key": key,
+            "files": [str(Path(path).resolve()) for path in (files or [output])],
+            "rendered_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def save(self) -> None:
+        _write_json(self.path, self._entries)
+
+
+class FragmentCache:
+    """
+    Fragmentos HTML de filas ya renderizadas de una salida, por hash de la fila.
+
+    Al agregar unas pocas partidas, solo se renderizan las filas nuevas o
+    modificadas; las demás se copian de la corrida anterior. Al guardar se
+    descartan los fragmentos que no se usaron.
+    """
+
+    def __init__(self, path: Union[str, Path], context: Any = None):
+        self.path = Path(path)
+        # Lo que cambia el HTML de una fila además de sus datos (modo de íconos, versión...)
+        self.context = digest_parts(RENDER_FORMAT, context)
+        stored = _read_json(self.path) or {}
+        self._previous: Dict[str, str] = stored.get("fragments", {}) if stored.get("context") == self.context else {}
+        self._current: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, row: Dict[str, Any], render: Callable[[], str]) -> str:
+        key = digest_parts(row)
+        html = self._current.get(key)
+        if html is None:
+            html = self._previous.get(key)
+            if html is None:
+                html = render()
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._current[key] = html
+        else:
+            self.hits += 1
+        return html
+
+    def save(self) -> None:
+        """Guarda los fragmentos usados en esta corrida; la siguiente parte de ellos."""
+        _write_json(self.path, {"context": self.context, "fragments": self._current})
+        self._previous, self._current = self._current, {}
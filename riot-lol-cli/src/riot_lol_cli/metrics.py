@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .rows import atomic_write
+
+# Límites superiores (ms) de los buckets del histograma de latencia
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Funciones mostradas al terminar una corrida con --profile
+PROFILE_TOP = 25
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos (sumar un valor es O(buckets))."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        for i, limit in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= limit:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Cota superior del bucket donde cae el cuantil ``q`` (aproximado)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        labels = [f"<={limit}" for limit in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class _EndpointStats:
+    __slots__ = ("requests", "errors", "retries", "bytes", "wait_s", "retry_after_s", "statuses", "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.wait_s = 0.0
+        self.retry_after_s = 0.0
+        self.statuses: Dict[int, int] = {}
+        self.latency = LatencyHistogram()
+
+
+class Metrics:
+    """
+    Métricas de una corrida: peticiones por endpoint (cantidad, latencia,
+    bytes, reintentos por 429 y tiempo esperando al limitador) y tiempos por
+    etapa (carga, render de filas, estadísticas...).
+
+    Se puede usar desde varios hilos. Los clientes y el render solo registran
+    si hay una instancia activa (``enable``); si no, el costo es un chequeo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    def _endpoint(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        return stats
+
+    def record_request(self, endpoint: str, status: int, seconds: float, nbytes: int = 0, wait: float = 0.0) -> None:
+        """Una respuesta HTTP: estado, latencia, bytes recibidos y espera previa del limitador."""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.requests += 1
+            stats.bytes += nbytes
+            stats.wait_s += wait
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status != 200 and status != 429:
+                stats.errors += 1
+            stats.latency.add(seconds * 1000)
+
+    def record_retry(self, endpoint: str, sleep_s: float) -> None:
+        """Un reintento por 429 y la pausa pedida por Retry-After (o el backoff)."""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.retries += 1
+            stats.retry_after_s += sleep_s
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = {"count": 0, "total_s": 0.0, "max_s": 0.0}
+            stage["count"] += 1
+            stage["total_s"] += seconds
+            stage["max_s"] = max(stage["max_s"], seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in sorted(self._endpoints.items()):
+                endpoints[endpoint] = {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "bytes": stats.bytes,
+                    "limiter_wait_s": round(stats.wait_s, 3),
+                    "retry_after_s": round(stats.retry_after_s, 3),
+                    "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+                    "latency": stats.latency.summary(),
+                }
+            stages = {
+                name: {"count": int(stage["count"]), "total_s": round(stage["total_s"], 4), "max_s": round(stage["max_s"], 4)}
+                for name, stage in self._stages.items()
+            }
+            return {
+                "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "elapsed_s": round(time.perf_counter() - self._started, 3),
+                "requests": {
+                    "total": sum(stats.requests for stats in self._endpoints.values()),
+                    "bytes": sum(stats.bytes for stats in self._endpoints.values()),
+                    "retries": sum(stats.retries for stats in self._endpoints.values()),
+                    "limiter_wait_s": round(sum(stats.wait_s for stats in self._endpoints.values()), 3),
+                },
+                "endpoints": endpoints,
+                "stages": stages,
+                "counters": dict(self._counters),
+            }
+
+    def write(self, path: Union[str, Path], extra: Optional[Dict[str, Any]] = None) -> None:
+        summary = self.summary()
+        if extra:
+            summary.update(extra)
+        with atomic_write(path) as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+_active: Optional[Metrics] = None
+
+
+def active() -> Optional[Metrics]:
+    """Las métricas de la corrida actual, o None si no se pidieron."""
+    return _active
+
+
+def enable(metrics: Optional[Metrics] = None) -> Metrics:
+    global _active
+    _active = metrics or Metrics()
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mide una etapa si hay métricas activas (sin métricas no hace nada)."""
+    metrics = _active
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name):
+        yield
+
+
+def _profile_top(profiler: Any, limit: int = PROFILE_TOP) -> str:
+    import io
+    import pstats
+
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+@contextmanager
+def profiled(metrics_out: Optional[Union[str, Path]] = None, profile: bool = False) -> Iterator[Metrics]:
+    """
+    Activa las métricas durante el bloque y, con ``profile``, lo corre bajo cProfile.
+
+    Al salir escribe el resumen JSON en ``metrics_out`` (si se indicó) y el
+    perfil en ``<metrics_out>.prof`` (abrible con ``python -m pstats`` o
+    snakeviz); las funciones más costosas se muestran por stderr.
+    """
+    metrics = enable()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        disable()
+        extra: Dict[str, Any] = {}
+        if profiler is not None:
+            if metrics_out:
+                prof_path = Path(metrics_out).with_suffix(".prof")
+                profiler.dump_stats(str(prof_path))
+                extra["profile"] = str(prof_path)
+            print(_profile_top(profiler), file=sys.stderr)
+        for line in format_summary(metrics.summary()):
+            print(f"   {line}", file=sys.stderr)
+        if metrics_out:
+            metrics.write(metrics_out, extra)
+            print(f"📈 Métricas guardadas en {metrics_out}", file=sys.stderr)
+
+
+def format_summary(summary: Dict[str, Any]) -> List[str]:
+    """Resumen corto y legible de ``Metrics.summary`` (una línea por endpoint y por etapa)."""
+    lines = []
+    for endpoint, stats in summary["endpoints"].items():
+        latency = stats["latency"]
+        lines.append(
+            f"{endpoint}: {stats['requests']} pet., p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms, "
+            f"{stats['bytes'] / 1024:.0f} KB, {stats['retries']} reintentos, {stats['limiter_wait_s']:.2f}s en espera"
+        )
+    for name, stage_stats in summary["stages"].items():
+        lines.append(f"{name}: {stage_stats['count']}x, {stage_stats['total_s']:.3f}s")
+    return lines
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Sequence, Union
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el json de la librería estándar
+    orjson = None
+
+# Campos de Match-V5 que usan las filas de matches.json y la base SQLite.
+# Agregar acá un campo es lo único necesario para tenerlo en la proyección.
+MATCH_INFO_FIELDS = (
+    "gameCreation",
+    "gameDuration",
+    "queueId",
+    "platformId",
+)
+
+PARTICIPANT_FIELDS = (
+    "puuid",
+    "championName",
+    "champLevel",
+    "teamPosition",
+    "kills",
+    "deaths",
+    "assists",
+    "win",
+    "item0",
+    "item1",
+    "item2",
+    "item3",
+    "item4",
+    "item5",
+    "item6",
+    "totalDamageDealtToChampions",
+    "goldEarned",
+    "visionScore",
+)
+
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Decodifica JSON con orjson si está instalado (varias veces más rápido) o con json."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _pick(source: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    return {field: source[field] for field in fields if field in source}
+
+
+def project_match(
+    payload: Dict[str, Any],
+    info_fields: Sequence[str] = MATCH_INFO_FIELDS,
+    participant_fields: Sequence[str] = PARTICIPANT_FIELDS,
+) -> Dict[str, Any]:
+    """
+    Copia mínima de una respuesta de Match-V5 con la misma forma
+    (``metadata.matchId``, ``info.<campo>``, ``info.participants[]``), solo
+    con los campos declarados.
+
+    La respuesta cruda trae cientos de campos por participante (desafíos,
+    pings, perks...); la proyección pesa una fracción, así que conviene
+    proyectar apenas se decodifica y soltar el payload crudo.
+    """
+    info = payload.get("info", {})
+    projected_info = _pick(info, info_fields)
+    projected_info["participants"] = [_pick(participant, participant_fields) for participant in info.get("participants", [])]
+    return {
+        "metadata": {"matchId": payload.get("metadata", {}).get("matchId")},
+        "info": projected_info,
+    }
+
+
+def participant_index(match: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Participantes de una partida por PUUID (se arma una vez por partida)."""
+    return {participant.get("puuid"): participant for participant in match.get("info", {}).get("participants", [])}
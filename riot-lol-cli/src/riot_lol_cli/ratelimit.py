@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+def parse_rate_header(value: Optional[str]) -> List[Tuple[int, int]]:
+    """
+    Parsea cabeceras de Riot del tipo "20:1,100:120" a [(20, 1), (100, 120)].
+    Ignora los tramos mal formados.
+    """
+    pairs: List[Tuple[int, int]] = []
+    for chunk in (value or "").split(","):
+        left, sep, right = chunk.strip().partition(":")
+        if not sep:
+            continue
+        try:
+            pairs.append((int(left), int(right)))
+        except ValueError:
+            continue
+    return pairs
+
+
+class _Bucket:
+    """Bucket de tokens que se recarga por completo al cerrar cada ventana de Riot."""
+
+    def __init__(self, limit: int, window: float, safety: float):
+        self.limit = limit
+        self.window = window
+        self.capacity = max(1, int(limit * safety))
+        self.tokens = self.capacity
+        self.reset_at: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        if self.reset_at is not None and now >= self.reset_at:
+            self.tokens = self.capacity
+            self.reset_at = None
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        if self.tokens > 0:
+            return 0.0
+        return max(0.0, (self.reset_at or now) - now)
+
+    def consume(self, now: float) -> None:
+        self.tokens -= 1
+        if self.reset_at is None:
+            self.reset_at = now + self.window
+
+    def sync(self, used: int, now: float) -> None:
+        """Ajusta los tokens con el conteo que informa el servidor (*-Count)."""
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+        if self.reset_at is None:
+            self.reset_at = now + self.window
+
+
+class RateLimiter:
+    """
+    Limitador proactivo para la API de Riot.
+
+    Mantiene buckets separados por host de enrutamiento (límite de aplicación)
+    y por host + endpoint (límite de método), configurados a partir de las
+    cabeceras X-App-Rate-Limit / X-Method-Rate-Limit y sus *-Count. Las
+    peticiones esperan lo justo para quedar por debajo del límite en lugar
+    de provocar un 429.
+    """
+
+    def __init__(self, safety: float = 0.95):
+        self.safety = safety
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, ...], List[_Bucket]] = {}
+        self._blocked_until: Dict[str, float] = {}
+
+    def _keys(self, host: str, endpoint: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        return ("app", host), ("method", host, endpoint)
+
+    def reserve(self, host: str, endpoint: str) -> float:
+        """
+        Intenta tomar cupo sin bloquear. Retorna 0 si lo tomó, o los segundos a
+        esperar antes de reintentar (para usar con time.sleep o asyncio.sleep).
+        """
+        with self._lock:
+            now = time.monotonic()
+            buckets = [b for key in self._keys(host, endpoint) for b in self._buckets.get(key, [])]
+            wait = max([self._blocked_until.get(host, now) - now] + [b.wait_time(now) for b in buckets])
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.consume(now)
+                return 0.0
+            return wait
+
+    def acquire(self, host: str, endpoint: str) -> float:
+        """Bloquea hasta que haya cupo para una petición. Retorna el tiempo esperado."""
+        waited = 0.0
+        while True:
+            wait = self.reserve(host, endpoint)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def update(self, host: str, endpoint: str, headers: Mapping[str, str]) -> None:
+        """Actualiza los buckets con las cabeceras de límite de una respuesta."""
+        app_key, method_key = self._keys(host, endpoint)
+        with self._lock:
+            now = time.monotonic()
+            for key, prefix in ((app_key, "X-App-Rate-Limit"), (method_key, "X-Method-Rate-Limit")):
+                limits = parse_rate_header(headers.get(prefix))
+                if not limits:
+                    continue
+                buckets = self._buckets.get(key)
+                if buckets is None or [(b.limit, b.window) for b in buckets] != limits:
+                    buckets = [_Bucket(limit, window, self.safety) for limit, window in limits]
+                    self._buckets[key] = buckets
+                counts = dict((window, used) for used, window in parse_rate_header(headers.get(f"{prefix}-Count")))
+                for bucket in buckets:
+                    if bucket.window in counts:
+                        bucket.sync(counts[bucket.window], now)
+
+    def block(self, host: str, seconds: float) -> None:
+        """Pausa todas las peticiones a un host (p. ej. tras un 429 con Retry-After)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), until)
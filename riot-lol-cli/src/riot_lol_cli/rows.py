@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Extensiones que se leen/escriben como NDJSON (una cabecera + una fila por línea)
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def is_ndjson(path: Union[str, Path]) -> bool:
+    return Path(path).suffix.lower() in NDJSON_SUFFIXES
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], mode: str = "w", encoding: str = "utf-8") -> Iterator[IO[Any]]:
+    """
+    Abre un temporal junto a ``path`` y, si el bloque termina sin errores, lo
+    vuelca a disco (fsync) y lo renombra sobre ``path``. Un corte o una
+    excepción a mitad nunca deja ``path`` a medias, y el temporal se borra.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def calculate_time_ago(game_date: datetime) -> str:
+    """Calcula cuánto tiempo hace que se jugó la partida"""
+    now = datetime.now()
+    delta = now - game_date
+    
+    if delta.days > 365:
+        years = delta.days // 365
+        return f"Hace {years} año{'s' if years > 1 else ''}"
+    elif delta.days > 30:
+        months = delta.days // 30
+        return f"Hace {months} mes{'es' if months > 1 else ''}"
+    elif delta.days > 0:
+        return f"Hace {delta.days} día{'s' if delta.days > 1 else ''}"
+    elif delta.seconds > 3600:
+        hours = delta.seconds // 3600
+        return f"Hace {hours} hora{'s' if hours > 1 else ''}"
+    elif delta.seconds > 60:
+        minutes = delta.seconds // 60
+        return f"Hace {minutes} minuto{'s' if minutes > 1 else ''}"
+    else:
+        return "Hace un momento"
+
+
+class NDJSONRowWriter:
+    """
+    Escribe partidas en formato NDJSON: la primera línea es la cabecera (metadatos
+    de la cuenta) y cada fila va en su propia línea, apenas se obtiene.
+
+    Se escribe sobre ``<ruta>.partial`` y se renombra al cerrar sin errores; si el
+    proceso se corta, las filas ya escritas quedan en el archivo parcial.
+    """
+
+    def __init__(self, path: Union[str, Path], header: Dict[str, Any]):
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self.count = 0
+        self.wins = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self._write_line(header)
+
+    def _write_line(self, obj: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+        self._file.flush()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self._write_line(row)
+        self.count += 1
+        if row.get("win"):
+            self.wins += 1
+
+    def write_all(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def close(self, commit: bool = True) -> None:
+        if self._file.closed:
+            return
+        if commit:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._file.close()
+        if commit:
+            os.replace(self.partial_path, self.path)
+
+    def __enter__(self) -> "NDJSONRowWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(commit=exc_type is None)
+
+
+def iter_ndjson_rows(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_ndjson(path: Union[str, Path]) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Abre un archivo NDJSON y retorna (cabecera, generador de filas).
+    Las filas se leen de a una; el archivo se cierra al agotar el generador.
+    """
+    f = open(path, "r", encoding="utf-8")
+    try:
+        first_line: Optional[str] = f.readline()
+        header = json.loads(first_line) if first_line and first_line.strip() else {}
+    except json.JSONDecodeError:
+        f.close()
+        raise
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        with f:
+            yield from iter_ndjson_rows(f)
+
+    return header, rows()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .rows import atomic_write
+
+DDRAGON_BASE = "https://ddragon.leagueoflegends.com"
+
+
+class StaticDataError(Exception):
+    pass
+
+
+class StaticData:
+    """
+    Datos estáticos de Data Dragon con caché en memoria y en disco.
+
+    - La lista de versiones se guarda con su fecha y se reutiliza durante ``ttl`` segundos.
+    - ``item.json`` y ``champion.json`` se guardan por versión e idioma (nunca cambian).
+    - Las búsquedas (ítem -> nombre, campeón -> nombre visible) son accesos a dicts.
+
+    Con ``offline=True`` solo se usa lo que ya está en disco, sin red: así el
+    render aprovecha lo que dejó el fetch sin agregar peticiones.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        session: Any = None,
+        ttl: float = 6 * 3600,
+        language: str = "es_MX",
+        timeout: int = 10,
+        offline: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.session = session
+        self.ttl = ttl
+        self.language = language
+        self.timeout = timeout
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._versions: Optional[List[str]] = None
+        self._versions_at = 0.0
+        self._data: Dict[tuple, Dict[str, Any]] = {}
+        self._indexes: Dict[tuple, Dict[str, Any]] = {}
+
+    # --- red y disco ---------------------------------------------------------
+
+    def _get_json(self, url: str) -> Any:
+        if self.session is not None:
+            # Sin la API key: Data Dragon es público y no debe recibirla
+            resp = self.session.get(url, timeout=self.timeout, headers={"X-Riot-Token": None})
+        else:
+            import requests
+
+            resp = requests.get(url, timeout=self.timeout)
+        if resp.status_code != 200:
+            raise StaticDataError(f"No se pudo obtener {url}: {resp.status_code}")
+        return resp.json()
+
+    def _read_disk(self, path: Path) -> Optional[Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, path: Path, data: Any) -> None:
+        with atomic_write(path) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    # --- versiones -----------------------------------------------------------
+
+    def versions(self) -> List[str]:
+        """Lista de versiones de Data Dragon (la primera es la más reciente)."""
+        with self._lock:
+            now = time.time()
+            if self._versions is not None and now - self._versions_at < self.ttl:
+                return self._versions
+            path = self.cache_dir / "versions.json" if self.cache_dir else None
+            cached = self._read_disk(path) if path else None
+            if cached and (self.offline or now - cached.get("fetched_at", 0) < self.ttl):
+                self._versions, self._versions_at = cached["versions"], cached["fetched_at"]
+                return self._versions
+            if self.offline:
+                raise StaticDataError("No hay versiones de Data Dragon en caché")
+            data = self._get_json(f"{DDRAGON_BASE}/api/versions.json")
+            if not isinstance(data, list) or not data:
+                raise StaticDataError("Respuesta inesperada de Data Dragon versions")
+            self._versions, self._versions_at = data, now
+            if path:
+                self._write_disk(path, {"fetched_at": now, "versions": data})
+            return data
+
+    def latest_version(self) -> str:
+        return self.versions()[0]
+
+    # --- item.json / champion.json ------------------------------------------
+
+    def _dataset(self, version: str, name: str) -> Dict[str, Any]:
+        key = (version, name)
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                return data
+            path = self.cache_dir / version / "data" / self.language / f"{name}.json" if self.cache_dir else None
+            data = self._read_disk(path) if path else None
+            if data is None:
+                if self.offline:
+                    data = {"data": {}}
+                else:
+                    data = self._get_json(f"{DDRAGON_BASE}/cdn/{version}/data/{self.language}/{name}.json")
+                    if path:
+                        self._write_disk(path, data)
+            self._data[key] = data
+            return data
+
+    def _index(self, version: str, name: str, build: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        key = (version, name)
+        index = self._indexes.get(key)
+        if index is None:
+            index = build(self._dataset(version, name).get("data", {}))
+            self._indexes[key] = index
+        return index
+
+    def items(self, version: str) -> Dict[str, Dict[str, Any]]:
+        """item.json de la versión: id de ítem (str) -> datos."""
+        return self._index(version, "item", lambda data: data)
+
+    def champions(self, version: str) -> Dict[str, Dict[str, Any]]:
+        """champion.json indexado por id ("TwistedFate") y por key numérica ("4")."""
+        def build(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+            index = dict(data)
+            for champ in data.values():
+                if "key" in champ:
+                    index[str(champ["key"])] = champ
+            return index
+
+        return self._index(version, "champion", build)
+
+    def item_name(self, version: str, item_id: Union[int, str]) -> Optional[str]:
+        item = self.items(version).get(str(item_id))
+        return item.get("name") if item else None
+
+    def champion_name(self, version: str, champ: Union[int, str]) -> Optional[str]:
+        """Nombre visible de un campeón a partir de su id ("MonkeyKing") o key ("62")."""
+        data = self.champions(version).get(str(champ))
+        return data.get("name") if data else None
+
+    def available(self) -> List[str]:
+        """Datos en disco como ``<versión>/<nombre>`` (p. ej. ``15.20.1/item``): lo que el modo offline puede resolver."""
+        if self.cache_dir is None:
+            return []
+        return sorted(f"{path.parents[2].name}/{path.stem}" for path in self.cache_dir.glob(f"*/data/{self.language}/*.json"))
+
+    def warm(self, version: str) -> None:
+        """Descarga (si falta) item.json y champion.json de la versión."""
+        self.items(version)
+        self.champions(version)
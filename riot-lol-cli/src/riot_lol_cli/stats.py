@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from array import array
+from datetime import datetime
+from html import escape
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usan arrays y bucles de Python
+    np = None
+
+# Columnas numéricas que se suman por grupo
+NUMERIC_FIELDS = ("win", "kills", "deaths", "assists", "damage", "gold", "vision", "minutes")
+
+# Ventanas de tiempo (días hacia atrás desde la partida más reciente)
+DEFAULT_WINDOWS = (7, 30)
+
+# Partidas consideradas para la forma reciente
+RECENT_GAMES = 20
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        # Match-V5 usa milisegundos
+        return value / 1000 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class MatchColumns:
+    """
+    Las filas de matches.json como columnas (una por estadística) para calcular
+    los agregados en bloque. Campeón y rol se guardan como códigos enteros.
+
+    Se llena fila a fila con ``append`` (sirve para NDJSON en streaming) y se
+    convierte a arrays de NumPy, o de ``array`` si NumPy no está, al calcular.
+    Las filas van en el orden de matches.json: la más reciente primero.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, List[float]] = {field: [] for field in NUMERIC_FIELDS}
+        self._created: List[float] = []
+        self._codes: Dict[str, List[int]] = {"champ": [], "role": []}
+        self.labels: Dict[str, List[str]] = {"champ": [], "role": []}
+        self._label_index: Dict[str, Dict[str, int]] = {"champ": {}, "role": {}}
+        self._frozen: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "MatchColumns":
+        columns = cls()
+        for row in rows:
+            columns.append(row)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self._created)
+
+    def _code(self, kind: str, label: str) -> int:
+        index = self._label_index[kind]
+        code = index.get(label)
+        if code is None:
+            code = index[label] = len(self.labels[kind])
+            self.labels[kind].append(label)
+        return code
+
+    def append(self, row: Dict[str, Any]) -> None:
+        values = self._values
+        values["win"].append(1.0 if row.get("win") is True else 0.0)
+        values["kills"].append(_number(row.get("kills")))
+        values["deaths"].append(_number(row.get("deaths")))
+        values["assists"].append(_number(row.get("assists")))
+        values["damage"].append(_number(row.get("total_damage_dealt")))
+        values["gold"].append(_number(row.get("gold_earned")))
+        values["vision"].append(_number(row.get("vision_score")))
+        values["minutes"].append(_number(row.get("game_duration_seconds")) / 60)
+        self._created.append(_timestamp(row.get("game_creation")))
+        self._codes["champ"].append(self._code("champ", str(row.get("champ") or "?")))
+        self._codes["role"].append(self._code("role", str(row.get("role") or "")))
+        self._frozen = None
+
+    def arrays(self) -> Dict[str, Any]:
+        """Columnas como arrays (NumPy si está disponible)."""
+        if self._frozen is None:
+            if np is not None:
+                frozen = {field: np.asarray(values, dtype=np.float64) for field, values in self._values.items()}
+                frozen["created"] = np.asarray(self._created, dtype=np.float64)
+                frozen.update({kind: np.asarray(codes, dtype=np.intp) for kind, codes in self._codes.items()})
+            else:
+                frozen = {field: array("d", values) for field, values in self._values.items()}
+                frozen["created"] = array("d", self._created)
+                frozen.update({kind: array("l", codes) for kind, codes in self._codes.items()})
+            self._frozen = frozen
+        return self._frozen
+
+
+def _group_sums(cols: Dict[str, Any], codes: Any, groups: int, mask: Any = None) -> Dict[str, Any]:
+    """Suma de cada columna numérica por grupo (más la cantidad de partidas)."""
+    if np is not None:
+        if mask is not None:
+            codes = codes[mask]
+        sums = {"games": np.bincount(codes, minlength=groups).astype(np.float64)}
+        for field in NUMERIC_FIELDS:
+            values = cols[field] if mask is None else cols[field][mask]
+            sums[field] = np.bincount(codes, weights=values, minlength=groups)
+        return sums
+
+    sums = {field: [0.0] * groups for field in ("games",) + NUMERIC_FIELDS}
+    columns = [(sums[field], cols[field]) for field in NUMERIC_FIELDS]
+    games = sums["games"]
+    for i, code in enumerate(codes):
+        if mask is not None and not mask[i]:
+            continue
+        games[code] += 1
+        for target, values in columns:
+            target[code] += values[i]
+    return sums
+
+
+def _summaries(sums: Dict[str, Any], labels: Sequence[str]) -> List[Dict[str, Any]]:
+    """Convierte las sumas por grupo en métricas legibles (win rate, KDA, x/min)."""
+    result = []
+    for i, label in enumerate(labels):
+        games = int(sums["games"][i])
+        if not games:
+            continue
+        wins = int(sums["win"][i])
+        kills, deaths, assists = float(sums["kills"][i]), float(sums["deaths"][i]), float(sums["assists"][i])
+        minutes = float(sums["minutes"][i]) or 1
+        result.append({
+            "name": label,
+            "games": games,
+            "wins": wins,
+            "losses": games - wins,
+            "win_rate": round(wins / games * 100, 1),
+            "kills": round(kills / games, 1),
+            "deaths": round(deaths / games, 1),
+            "assists": round(assists / games, 1),
+            "kda": round((kills + assists) / deaths if deaths else kills + assists, 2),
+            "damage_per_min": round(float(sums["damage"][i]) / minutes, 1),
+            "gold_per_min": round(float(sums["gold"][i]) / minutes, 1),
+            "vision_per_min": round(float(sums["vision"][i]) / minutes, 2),
+        })
+    result.sort(key=lambda group: (-group["games"], group["name"]))
+    return result
+
+
+def _empty_summary(name: str) -> Dict[str, Any]:
+    summary = {key: 0.0 for key in ("win_rate", "kills", "deaths", "assists", "kda",
+                                    "damage_per_min", "gold_per_min", "vision_per_min")}
+    summary.update({"name": name, "games": 0, "wins": 0, "losses": 0})
+    return summary
+
+
+def _streaks(wins: Any) -> Dict[str, Any]:
+    """Racha actual (desde la partida más reciente) y las más largas de victorias y derrotas."""
+    count = len(wins)
+    if not count:
+        return {"current": 0, "current_win": False, "longest_win": 0, "longest_loss": 0}
+    if np is not None:
+        # Inicio de cada racha: donde cambia el resultado
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(wins)) + 1))
+        lengths = np.diff(np.concatenate((starts, [count])))
+        results = wins[starts] > 0
+        current, current_win = int(lengths[0]), bool(results[0])
+        longest_win = int(lengths[results].max()) if results.any() else 0
+        longest_loss = int(lengths[~results].max()) if (~results).any() else 0
+    else:
+        runs = []
+        for value in wins:
+            if runs and runs[-1][0] == value:
+                runs[-1][1] += 1
+            else:
+                runs.append([value, 1])
+        current, current_win = runs[0][1], runs[0][0] > 0
+        longest_win = max((length for value, length in runs if value > 0), default=0)
+        longest_loss = max((length for value, length in runs if value <= 0), default=0)
+    return {"current": current, "current_win": current_win, "longest_win": longest_win, "longest_loss": longest_loss}
+
+
+def compute_stats(
+    rows: Any,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    recent: int = RECENT_GAMES,
+) -> Dict[str, Any]:
+    """
+    Estadísticas agregadas de un historial: totales, por campeón, por rol, por
+    ventana de tiempo (últimos N días), rachas y forma reciente.
+
+    ``rows`` puede ser un ``MatchColumns`` ya cargado o un iterable de filas.
+    """
+    columns = rows if isinstance(rows, MatchColumns) else MatchColumns.from_rows(rows)
+    cols = columns.arrays()
+    count = len(columns)
+    zeros = np.zeros(count, dtype=np.intp) if np is not None else array("l", bytes(count * array("l").itemsize))
+
+    totals = _summaries(_group_sums(cols, zeros, 1), ["total"])
+    stats: Dict[str, Any] = totals[0] if totals else _empty_summary("total")
+    stats["champions"] = _summaries(_group_sums(cols, cols["champ"], len(columns.labels["champ"])), columns.labels["champ"])
+    stats["roles"] = _summaries(_group_sums(cols, cols["role"], len(columns.labels["role"])), columns.labels["role"])
+
+    stats["windows"] = []
+    newest = max(cols["created"]) if count else 0.0
+    for days in windows:
+        since = newest - days * 86400
+        if np is not None:
+            mask = cols["created"] >= since
+        else:
+            mask = [created >= since for created in cols["created"]]
+        window = _summaries(_group_sums(cols, zeros, 1, mask), [f"last_{days}d"])
+        window = window[0] if window else _empty_summary(f"last_{days}d")
+        window["days"] = days
+        stats["windows"].append(window)
+
+    stats["streaks"] = _streaks(cols["win"])
+    last = cols["win"][:recent]
+    last_games = len(last)
+    last_wins = int(sum(last))
+    stats["recent"] = {
+        "games": last_games,
+        "wins": last_wins,
+        "win_rate": round(last_wins / last_games * 100, 1) if last_games else 0.0,
+        "form": "".join("V" if value > 0 else "D" for value in last[:10]),
+    }
+    return stats
+
+
+def _streak_text(length: int, win: bool) -> str:
+    if not length:
+        return "-"
+    if win:
+        return f"{length} victoria{'s' if length != 1 else ''}"
+    return f"{length} derrota{'s' if length != 1 else ''}"
+
+
+def _group_rows_html(groups: List[Dict[str, Any]], limit: Optional[int] = None) -> str:
+    rows = []
+    for group in groups[:limit]:
+        rows.append(
+            f'<tr class="stats-row"><td class="stats-name">{escape(group["name"] or "Sin rol")}</td>'
+            f'<td>{group["games"]}</td><td>{group["win_rate"]:.1f}%</td><td>{group["kda"]:.2f}</td>'
+            f'<td>{group["damage_per_min"]:.0f}</td><td>{group["gold_per_min"]:.0f}</td>'
+            f'<td>{group["vision_per_min"]:.2f}</td></tr>'
+        )
+    return "".join(rows)
+
+
+def stats_placeholders(stats: Dict[str, Any], top_champions: int = 10) -> Dict[str, str]:
+    """
+    Placeholders listos para las plantillas a partir de ``compute_stats``.
+
+    Las tablas (``champion_stats_rows``, ``role_stats_rows``, ``window_stats_rows``)
+    son filas ``<tr>`` con: nombre, partidas, % victorias, KDA, daño/min, oro/min y visión/min.
+    """
+    streaks = stats["streaks"]
+    champions = stats["champions"]
+    windows = [dict(window, name=f"Últimos {window['days']} días") for window in stats["windows"]]
+    return {
+        "total_matches": str(stats["games"]),
+        "wins": str(stats["wins"]),
+        "losses": str(stats["losses"]),
+        "win_rate": f"{stats['win_rate']:.1f}%",
+        "avg_kills": f"{stats['kills']:.1f}",
+        "avg_deaths": f"{stats['deaths']:.1f}",
+        "avg_assists": f"{stats['assists']:.1f}",
+        "avg_kda": f"{stats['kda']:.2f}",
+        "damage_per_min": f"{stats['damage_per_min']:.0f}",
+        "gold_per_min": f"{stats['gold_per_min']:.0f}",
+        "vision_per_min": f"{stats['vision_per_min']:.2f}",
+        "current_streak": _streak_text(streaks["current"], streaks["current_win"]),
+        "longest_win_streak": str(streaks["longest_win"]),
+        "longest_loss_streak": str(streaks["longest_loss"]),
+        "recent_win_rate": f"{stats['recent']['win_rate']:.1f}%",
+        "recent_form": stats["recent"]["form"],
+        "top_champion": escape(champions[0]["name"]) if champions else "-",
+        "champion_stats_rows": _group_rows_html(champions, top_champions),
+        "role_stats_rows": _group_rows_html(stats["roles"]),
+        "window_stats_rows": _group_rows_html(windows),
+    }
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .league import RANKED_QUEUES
+from .rows import calculate_time_ago
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    game_creation INTEGER NOT NULL,
+    game_duration INTEGER,
+    queue_id INTEGER,
+    platform TEXT,
+    ddragon_version TEXT
+);
+CREATE TABLE IF NOT EXISTS participants (
+    match_id TEXT NOT NULL REFERENCES matches(match_id),
+    puuid TEXT NOT NULL,
+    champion_name TEXT COLLATE NOCASE,
+    team_position TEXT,
+    win INTEGER,
+    queue_id INTEGER,
+    game_creation INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    PRIMARY KEY (match_id, puuid)
+);
+CREATE TABLE IF NOT EXISTS accounts (
+    puuid TEXT PRIMARY KEY,
+    game_name TEXT NOT NULL,
+    tag_line TEXT NOT NULL,
+    platform TEXT,
+    level INTEGER,
+    profile_icon_id INTEGER,
+    ddragon_version TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS rank_snapshots (
+    puuid TEXT NOT NULL,
+    queue_type TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    tier TEXT,
+    division TEXT,
+    lp INTEGER,
+    wins INTEGER,
+    losses INTEGER,
+    PRIMARY KEY (puuid, queue_type, taken_at)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_creation ON matches (game_creation);
+CREATE INDEX IF NOT EXISTS idx_matches_queue ON matches (queue_id, game_creation);
+CREATE INDEX IF NOT EXISTS idx_participants_puuid ON participants (puuid, game_creation);
+CREATE INDEX IF NOT EXISTS idx_participants_creation ON participants (game_creation);
+CREATE INDEX IF NOT EXISTS idx_participants_queue ON participants (queue_id, game_creation);
+CREATE INDEX IF NOT EXISTS idx_participants_champion ON participants (champion_name, game_creation);
+CREATE INDEX IF NOT EXISTS idx_participants_puuid_champion ON participants (puuid, champion_name, game_creation);
+CREATE INDEX IF NOT EXISTS idx_participants_puuid_queue ON participants (puuid, queue_id, game_creation);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_riot_id ON accounts (game_name COLLATE NOCASE, tag_line COLLATE NOCASE);
+"""
+
+# Partidas escritas entre commits (una transacción por lote, no por partida)
+COMMIT_EVERY = 50
+
+
+def _epoch_ms(value: Union[None, int, float, datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    # Segundos (como --since en la CLI) o milisegundos (como Match-V5)
+    return int(value if value > 1e11 else value * 1000)
+
+
+class MatchStore:
+    """
+    Base SQLite compartida por todas las cuentas seguidas.
+
+    - ``matches``: metadatos de cada partida (una fila por ``match_id``).
+    - ``participants``: la fila de matches.json de cada participante, con
+      campeón, cola, resultado y fecha en columnas indexadas.
+    - ``accounts``: Riot ID, nivel e ícono de cada cuenta descargada.
+    - ``rank_snapshots``: rango por cola (League-V4) en cada corrida del fetch.
+
+    Las consultas por jugador, campeón, cola y rango de fechas usan índices
+    (``puuid, champion_name, game_creation``, etc.) en lugar de recorrer archivos.
+    Se puede escribir desde varios hilos; las escrituras se agrupan en lotes.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    # --- escritura -----------------------------------------------------------
+
+    def put_match(self, match_detail: Dict[str, Any], rows: Dict[str, Dict[str, Any]]) -> None:
+        """Guarda (o reemplaza) una partida y las filas de sus participantes ({puuid: fila})."""
+        info = match_detail.get("info", {})
+        match_id = match_detail.get("metadata", {}).get("matchId") or next(iter(rows.values()), {}).get("match_id")
+        game_creation = int(info.get("gameCreation") or 0)
+        queue_id = info.get("queueId")
+        teams = {p.get("puuid"): p for p in info.get("participants", [])}
+        participant_rows = []
+        for puuid, row in rows.items():
+            participant = teams.get(puuid, {})
+            stored = {key: value for key, value in row.items() if key != "time_ago"}
+            participant_rows.append((
+                match_id,
+                puuid,
+                row.get("champ"),
+                participant.get("teamPosition") or row.get("role"),
+                1 if row.get("win") else 0,
+                queue_id,
+                game_creation,
+                json.dumps(stored, ensure_ascii=False, separators=(",", ":")),
+            ))
+        version = next(iter(rows.values()), {}).get("ddragon_version")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?)",
+                (match_id, game_creation, info.get("gameDuration"), queue_id, info.get("platformId"), version),
+            )
+            self._conn.executemany("INSERT OR REPLACE INTO participants VALUES (?, ?, ?, ?, ?, ?, ?, ?)", participant_rows)
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY:
+                self._conn.commit()
+                self._pending = 0
+
+    def put_account(self, account: Dict[str, Any], platform: str, ddragon_version: Optional[str] = None) -> None:
+        with self._lock:
+            # Un Riot ID puede cambiar de dueño: se libera antes de asignarlo
+            self._conn.execute(
+                "DELETE FROM accounts WHERE game_name = ? COLLATE NOCASE AND tag_line = ? COLLATE NOCASE AND puuid != ?",
+                (account["game_name"], account["tag_line"], account["puuid"]),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (account["puuid"], account["game_name"], account["tag_line"], platform,
+                 account.get("level"), account.get("profileIconId"), ddragon_version, time.time()),
+            )
+            ranks = account.get("ranks")
+            if ranks:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rank_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(account["puuid"], entry["queue_type"], ranks["taken_at"], entry.get("tier"),
+                      entry.get("division"), entry.get("lp"), entry.get("wins"), entry.get("losses"))
+                     for entry in ranks.get("entries", [])],
+                )
+            self._conn.commit()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "MatchStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- lectura -------------------------------------------------------------
+
+    def __contains__(self, match_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM matches WHERE match_id = ?", (match_id,)).fetchone() is not None
+
+    def account(self, riot_id_or_puuid: str) -> Optional[Dict[str, Any]]:
+        """Busca una cuenta por ``nombre#tag`` (sin distinguir mayúsculas) o por PUUID."""
+        if "#" in riot_id_or_puuid:
+            game_name, tag_line = riot_id_or_puuid.rsplit("#", 1)
+            query = "SELECT * FROM accounts WHERE game_name = ? COLLATE NOCASE AND tag_line = ? COLLATE NOCASE"
+            params: Tuple[Any, ...] = (game_name.strip(), tag_line.strip())
+        else:
+            query, params = "SELECT * FROM accounts WHERE puuid = ?", (riot_id_or_puuid,)
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            found = cursor.fetchone()
+            if found is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], found))
+
+    def accounts(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM accounts ORDER BY game_name COLLATE NOCASE")
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, found)) for found in cursor.fetchall()]
+
+    def ranks(self, puuid: str) -> Optional[Dict[str, Any]]:
+        """Última foto de rango de la cuenta, con la forma de ``league.rank_snapshot`` (None si no hay)."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT MAX(taken_at) FROM rank_snapshots WHERE puuid = ?", (puuid,)
+            ).fetchone()[0]
+            if found is None:
+                return None
+            entries = self._conn.execute(
+                "SELECT queue_type, tier, division, lp, wins, losses FROM rank_snapshots"
+                " WHERE puuid = ? AND taken_at = ? ORDER BY queue_type",
+                (puuid, found),
+            ).fetchall()
+        return {
+            "taken_at": found,
+            "entries": [
+                {"queue_type": queue_type, "queue_id": RANKED_QUEUES.get(queue_type), "tier": tier,
+                 "division": division, "lp": lp, "wins": wins, "losses": losses}
+                for queue_type, tier, division, lp, wins, losses in entries
+            ],
+        }
+
+    def _where(
+        self,
+        puuid: Optional[str],
+        champion: Optional[str],
+        queue: Optional[int],
+        since: Any,
+        until: Any,
+        win: Optional[bool],
+    ) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if puuid is not None:
+            clauses.append("puuid = ?")
+            params.append(puuid)
+        if champion is not None:
+            clauses.append("champion_name = ?")
+            params.append(champion)
+        if queue is not None:
+            clauses.append("queue_id = ?")
+            params.append(int(queue))
+        if since is not None:
+            clauses.append("game_creation >= ?")
+            params.append(_epoch_ms(since))
+        if until is not None:
+            clauses.append("game_creation < ?")
+            params.append(_epoch_ms(until))
+        if win is not None:
+            clauses.append("win = ?")
+            params.append(1 if win else 0)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query_rows(
+        self,
+        puuid: Optional[str] = None,
+        champion: Optional[str] = None,
+        queue: Optional[int] = None,
+        since: Any = None,
+        until: Any = None,
+        win: Optional[bool] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Filas con el esquema de matches.json, más recientes primero.
+
+        ``since``/``until`` aceptan ``datetime`` o epoch (segundos o ms). Las filas
+        se leen del cursor de a lotes y ``time_ago`` se recalcula al leer.
+        """
+        where, params = self._where(puuid, champion, queue, since, until, win)
+        query = f"SELECT row, game_creation FROM participants{where} ORDER BY game_creation DESC"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else int(limit), int(offset)]
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+        while True:
+            with self._lock:
+                batch = cursor.fetchmany(256)
+            if not batch:
+                return
+            for raw, game_creation in batch:
+                row = json.loads(raw)
+                row["time_ago"] = calculate_time_ago(datetime.fromtimestamp(game_creation / 1000))
+                yield row
+
+    def count_rows(self, puuid: Optional[str] = None, **filters: Any) -> int:
+        where, params = self._where(
+            puuid, filters.get("champion"), filters.get("queue"), filters.get("since"),
+            filters.get("until"), filters.get("win"),
+        )
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM participants{where}", params).fetchone()[0]
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .rows import atomic_write
+
+# Campos de participantFrames que se conservan (nombre de columna -> ruta en el frame)
+FRAME_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "totalGold": ("totalGold",),
+    "currentGold": ("currentGold",),
+    "xp": ("xp",),
+    "level": ("level",),
+    "minionsKilled": ("minionsKilled",),
+    "jungleMinionsKilled": ("jungleMinionsKilled",),
+    "damageToChampions": ("damageStats", "totalDamageDoneToChampions"),
+}
+
+# Entero de 32 bits con signo: alcanza para oro, xp y daño de cualquier partida
+TYPECODE = "i"
+
+MAGIC = b"LTL1"
+_HEADER_LEN = struct.Struct("<I")
+
+
+class TimelineError(Exception):
+    pass
+
+
+def _frame_value(frame: Dict[str, Any], path: Tuple[str, ...]) -> int:
+    value: Any = frame
+    for key in path:
+        if not isinstance(value, dict):
+            return 0
+        value = value.get(key)
+    return int(value or 0)
+
+
+class CompactTimeline:
+    """
+    Línea de tiempo de Match-V5 guardada por columnas.
+
+    Cada campo de ``FRAME_FIELDS`` es un ``array`` de enteros con los valores de
+    todos los participantes, uno detrás de otro: ``frame_count`` valores por
+    participante, en el orden de ``puuids``. Los eventos no se guardan.
+
+    Las instancias que vienen de ``TimelineStore.load`` solo leen la cabecera;
+    cada columna se lee del archivo la primera vez que se pide.
+    """
+
+    def __init__(
+        self,
+        match_id: str,
+        frame_interval_ms: int,
+        puuids: Sequence[str],
+        frame_count: int,
+        columns: Optional[Dict[str, array]] = None,
+        source: Optional[Tuple[Path, Dict[str, Tuple[int, int]], str]] = None,
+    ):
+        self.match_id = match_id
+        self.frame_interval_ms = frame_interval_ms
+        self.puuids = list(puuids)
+        self.frame_count = frame_count
+        self._columns: Dict[str, array] = dict(columns or {})
+        # (archivo, {campo: (offset, bytes)}, byteorder) para la carga perezosa
+        self._source = source
+        self._lock = threading.Lock()
+
+    @property
+    def fields(self) -> List[str]:
+        if self._source is not None:
+            return list(self._source[1])
+        return list(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados por las columnas cargadas."""
+        return sum(column.itemsize * len(column) for column in self._columns.values())
+
+    def column(self, field: str) -> array:
+        column = self._columns.get(field)
+        if column is not None:
+            return column
+        if self._source is None or field not in self._source[1]:
+            raise KeyError(field)
+        path, offsets, byteorder = self._source
+        offset, size = offsets[field]
+        with self._lock:
+            column = self._columns.get(field)
+            if column is None:
+                column = array(TYPECODE)
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    column.frombytes(f.read(size))
+                if byteorder != sys.byteorder:
+                    column.byteswap()
+                self._columns[field] = column
+        return column
+
+    def series(self, puuid: str, field: str) -> array:
+        """Valores de ``field`` de un participante, un valor por frame."""
+        try:
+            index = self.puuids.index(puuid)
+        except ValueError:
+            raise TimelineError(f"El PUUID no participa en {self.match_id}")
+        start = index * self.frame_count
+        return self.column(field)[start:start + self.frame_count]
+
+    def per_minute(self, puuid: str, field: str) -> List[float]:
+        """Incremento de ``field`` por minuto entre frames consecutivos (p. ej. oro/min)."""
+        values = self.series(puuid, field)
+        minutes = self.frame_interval_ms / 60000 or 1
+        return [(values[i] - values[i - 1]) / minutes for i in range(1, len(values))]
+
+    def value_at(self, puuid: str, field: str, minute: int) -> Optional[int]:
+        """Valor de ``field`` en el minuto indicado (None si la partida terminó antes)."""
+        frame = int(minute * 60000 / (self.frame_interval_ms or 60000))
+        values = self.series(puuid, field)
+        return values[frame] if 0 <= frame < len(values) else None
+
+
+def compact_timeline(payload: Dict[str, Any]) -> CompactTimeline:
+    """Convierte la respuesta de ``/lol/match/v5/matches/{id}/timeline`` a columnas."""
+    metadata = payload.get("metadata", {})
+    info = payload.get("info", {})
+    frames = info.get("frames") or []
+    puuids = metadata.get("participants") or [p.get("puuid") for p in info.get("participants", [])]
+    if not puuids:
+        raise TimelineError("La línea de tiempo no tiene participantes")
+
+    frame_count = len(frames)
+    columns = {field: array(TYPECODE, [0]) * (len(puuids) * frame_count) for field in FRAME_FIELDS}
+    for f, frame in enumerate(frames):
+        participant_frames = frame.get("participantFrames", {})
+        for p in range(len(puuids)):
+            # participantFrames usa ids "1".."10" en el orden de metadata.participants
+            pframe = participant_frames.get(str(p + 1))
+            if not pframe:
+                continue
+            offset = p * frame_count + f
+            for field, path in FRAME_FIELDS.items():
+                columns[field][offset] = _frame_value(pframe, path)
+
+    return CompactTimeline(
+        match_id=metadata.get("matchId", ""),
+        frame_interval_ms=int(info.get("frameInterval") or 60000),
+        puuids=puuids,
+        frame_count=frame_count,
+        columns=columns,
+    )
+
+
+class TimelineStore:
+    """
+    Líneas de tiempo compactas en disco, un archivo ``<match_id>.tl`` por partida:
+    ``MAGIC``, largo de la cabecera, cabecera JSON y luego las columnas en binario.
+
+    Las líneas de tiempo no cambian, así que nunca se vuelven a descargar.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def path_for(self, match_id: str) -> Path:
+        return self.directory / f"{match_id}.tl"
+
+    def __contains__(self, match_id: str) -> bool:
+        return self.path_for(match_id).exists()
+
+    def put(self, timeline: CompactTimeline) -> Path:
+        offsets = {}
+        blobs = []
+        position = 0
+        for field in timeline.fields:
+            blob = timeline.column(field).tobytes()
+            offsets[field] = [position, len(blob)]
+            blobs.append(blob)
+            position += len(blob)
+        header = json.dumps({
+            "match_id": timeline.match_id,
+            "frame_interval_ms": timeline.frame_interval_ms,
+            "puuids": timeline.puuids,
+            "frame_count": timeline.frame_count,
+            "typecode": TYPECODE,
+            "byteorder": sys.byteorder,
+            "columns": offsets,
+        }, separators=(",", ":")).encode("utf-8")
+
+        path = self.path_for(timeline.match_id)
+        with atomic_write(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        return path
+
+    def load(self, match_id: str) -> Optional[CompactTimeline]:
+        """Lee solo la cabecera; las columnas se cargan al usarlas. None si no está."""
+        path = self.path_for(match_id)
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise TimelineError(f"Archivo de línea de tiempo inválido: {path}")
+                (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+                header = json.loads(f.read(header_len).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        if header.get("typecode") != TYPECODE:
+            raise TimelineError(f"Tipo de columnas no soportado en {path}")
+        base = len(MAGIC) + _HEADER_LEN.size + header_len
+        offsets = {field: (base + offset, size) for field, (offset, size) in header["columns"].items()}
+        return CompactTimeline(
+            match_id=header["match_id"],
+            frame_interval_ms=header["frame_interval_ms"],
+            puuids=header["puuids"],
+            frame_count=header["frame_count"],
+            source=(path, offsets, header["byteorder"]),
+        )
+
+
+# --- resumen para los reportes ---------------------------------------------------
+
+# Minutos de la tabla de ``timeline_stats_rows``
+TIMELINE_MINUTES = (5, 10, 15, 20, 25, 30)
+
+# Placeholders que necesitan leer líneas de tiempo (si la plantilla no usa
+# ninguno, el render no toca los archivos .tl)
+TIMELINE_PLACEHOLDERS = frozenset({
+    "timeline_games",
+    "timeline_stats_rows",
+    "timeline_curve_json",
+    "gold_at_10",
+    "xp_at_10",
+    "cs_at_10",
+})
+
+# Curvas promediadas: nombre -> columnas de FRAME_FIELDS que se suman
+CURVES: Dict[str, Tuple[str, ...]] = {
+    "gold": ("totalGold",),
+    "xp": ("xp",),
+    "cs": ("minionsKilled", "jungleMinionsKilled"),
+}
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def summarize_timelines(store: TimelineStore, match_ids: Sequence[str], puuid: str) -> Dict[str, Any]:
+    """
+    Oro, xp y CS por minuto de un jugador, promediados sobre sus partidas con
+    línea de tiempo guardada.
+
+    - ``curves``: por curva, el valor medio en cada frame (índice = minuto).
+    - ``per_minute``: por curva, la ganancia media en cada minuto.
+    - ``games``: partidas que aportaron datos (las que no tienen .tl se omiten).
+
+    Solo se leen las columnas de ``CURVES``; el resto del archivo no se carga.
+    """
+    sums: Dict[str, List[float]] = {name: [] for name in CURVES}
+    counts: List[int] = []
+    games = 0
+    for match_id in match_ids:
+        timeline = store.load(match_id)
+        if timeline is None or puuid not in timeline.puuids:
+            continue
+        games += 1
+        series = {
+            name: [sum(values) for values in zip(*(timeline.series(puuid, field) for field in fields))]
+            for name, fields in CURVES.items()
+        }
+        frames = min(len(values) for values in series.values())
+        for frame in range(frames):
+            if frame == len(counts):
+                counts.append(0)
+                for values in sums.values():
+                    values.append(0.0)
+            counts[frame] += 1
+            for name, values in series.items():
+                sums[name][frame] += values[frame]
+    curves = {name: [total / counts[frame] for frame, total in enumerate(values)] for name, values in sums.items()}
+    return {
+        "games": games,
+        "frame_counts": counts,
+        "curves": curves,
+        "per_minute": {name: [curve[i] - curve[i - 1] for i in range(1, len(curve))] for name, curve in curves.items()},
+    }
+
+
+def timeline_placeholders(summary: Dict[str, Any], minutes: Sequence[int] = TIMELINE_MINUTES) -> Dict[str, str]:
+    """
+    Placeholders de ``summarize_timelines`` para las plantillas.
+
+    ``timeline_stats_rows`` son filas ``<tr>`` con: minuto, partidas, oro, xp,
+    CS y oro/xp/CS por minuto hasta ese minuto. ``timeline_curve_json`` tiene
+    las curvas completas (valor medio por minuto) para graficarlas.
+    """
+    curves = summary["curves"]
+    counts = summary["frame_counts"]
+
+    def at(name: str, minute: int) -> str:
+        return f"{curves[name][minute]:.0f}" if minute < len(counts) else "-"
+
+    rows = []
+    for minute in minutes:
+        if minute >= len(counts):
+            break
+        rate = {name: curves[name][minute] / minute for name in CURVES}
+        rows.append(
+            f'<tr class="stats-row"><td class="stats-name">{minute}\'</td><td>{counts[minute]}</td>'
+            f'<td>{curves["gold"][minute]:.0f}</td><td>{curves["xp"][minute]:.0f}</td><td>{curves["cs"][minute]:.1f}</td>'
+            f'<td>{rate["gold"]:.0f}</td><td>{rate["xp"]:.0f}</td><td>{rate["cs"]:.2f}</td></tr>'
+        )
+    if not rows:
+        rows.append('<tr class="stats-row"><td colspan="8">Sin líneas de tiempo (descárgalas con --timelines)</td></tr>')
+    curve_json = {name: [round(value, 1) for value in curve] for name, curve in curves.items()}
+    return {
+        "timeline_games": str(summary["games"]),
+        "timeline_stats_rows": "".join(rows),
+        "timeline_curve_json": json.dumps(curve_json, separators=(",", ":")),
+        "gold_at_10": at("gold", 10),
+        "xp_at_10": at("xp", 10),
+        "cs_at_10": at("cs", 10),
+    }
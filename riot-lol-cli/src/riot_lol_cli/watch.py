@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+# Estado de un archivo: (mtime en ns, tamaño); None si no existe (p. ej. a mitad de un guardado)
+FileState = Optional[Tuple[int, int]]
+
+
+def file_state(path: Path) -> FileState:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """
+    Detecta cambios en un conjunto de archivos comparando mtime y tamaño.
+
+    Es polling con ``os.stat`` (sin dependencias ni hilos): con unas pocas
+    rutas cada sondeo cuesta microsegundos. ``wait`` agrupa las ráfagas de
+    cambios (un editor que guarda varias veces, un fetch que reescribe el
+    JSON) y solo retorna cuando los archivos dejan de cambiar por ``debounce``
+    segundos.
+    """
+
+    def __init__(self, paths: Iterable[Union[str, Path]], interval: float = 0.25, debounce: float = 0.2):
+        self.interval = interval
+        self.debounce = debounce
+        self._states: Dict[Path, FileState] = {Path(path): file_state(Path(path)) for path in paths}
+
+    @property
+    def paths(self) -> Set[Path]:
+        return set(self._states)
+
+    def poll(self) -> Set[Path]:
+        """Archivos que cambiaron (o aparecieron/desaparecieron) desde el último sondeo."""
+        changed = set()
+        for path, previous in self._states.items():
+            current = file_state(path)
+            if current != previous:
+                self._states[path] = current
+                changed.add(path)
+        return changed
+
+    def wait(self, should_stop: Optional[Callable[[], bool]] = None) -> Set[Path]:
+        """Bloquea hasta que haya cambios y la ráfaga termine; retorna los archivos cambiados."""
+        changed: Set[Path] = set()
+        last_change = 0.0
+        while True:
+            if should_stop is not None and should_stop():
+                return changed
+            found = self.poll()
+            now = time.monotonic()
+            if found:
+                changed |= found
+                last_change = now
+            elif changed and now - last_change >= self.debounce:
+                # Un archivo que desapareció y no volvió no tiene nada que renderizar
+                return {path for path in changed if self._states[path] is not None}
+            time.sleep(min(self.interval, self.debounce) if changed else self.interval)